@@ -0,0 +1,70 @@
+import math
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from catalog import DIFFICULTY_LEVELS
+from interviewer import skill_level_for
+
+
+# An adaptive interview asks between these many questions, starting at the given level
+ADAPTIVE_MIN_QUESTIONS = 3
+ADAPTIVE_MAX_QUESTIONS = len(DIFFICULTY_LEVELS)
+ADAPTIVE_START_LEVEL = 1
+
+# z-score of the confidence interval that must fit inside one skill level band to stop early (95%)
+ADAPTIVE_CONFIDENCE_Z = 1.96
+
+
+def score_interval(scores: List[int], z: float = ADAPTIVE_CONFIDENCE_Z) -> Tuple[float, float]:
+    """
+    Return a (low, high) confidence interval, in percent, for the share of points
+    the candidate would earn over a full interview.
+
+    Each question is treated as two pass/fail trials and the Wilson score interval
+    is used, which stays sensible for the all-or-nothing runs common in short interviews.
+    """
+    trials = 2 * len(scores)
+    if trials == 0:
+        return 0.0, 100.0
+    p = sum(scores) / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - margin) * 100, min(1.0, center + margin) * 100
+
+
+def skill_level_settled(scores: List[int]) -> bool:
+    """Return True once both ends of the confidence interval fall in the same skill level band."""
+    if len(scores) < ADAPTIVE_MIN_QUESTIONS:
+        return False
+    low, high = score_interval(scores)
+    return skill_level_for(low) == skill_level_for(high)
+
+
+def next_level(level: int, score: int) -> int:
+    """Step up a level after a full-credit answer, down after a failed one, and stay otherwise."""
+    step = {2: 1, 1: 0, 0: -1}[score]
+    return min(max(level + step, min(DIFFICULTY_LEVELS)), max(DIFFICULTY_LEVELS))
+
+
+def choose_topic(level: int, asked_topics: Iterable[str]) -> str:
+    """Pick a topic of the level that has not come up yet, if there is one."""
+    topics = DIFFICULTY_LEVELS[level]["topics"]
+    asked = set(asked_topics)
+    return random.choice([topic for topic in topics if topic not in asked] or topics)
+
+
+def choose_next_question(questions_answers: List[Dict], scores: List[int]) -> Optional[Tuple[int, str]]:
+    """
+    Return the (level, topic) of the next question for an adaptive interview, or
+    None once the skill level is settled or the question limit is reached.
+
+    `scores` holds the score of every question asked so far, with skipped ones as 0.
+    """
+    if len(questions_answers) >= ADAPTIVE_MAX_QUESTIONS or skill_level_settled(scores):
+        return None
+    if not questions_answers:
+        level = ADAPTIVE_START_LEVEL
+    else:
+        level = next_level(questions_answers[-1]['difficulty_level'], scores[-1])
+    return level, choose_topic(level, (qa.get('topic') for qa in questions_answers))
@@ -0,0 +1,201 @@
+"""
+Offline benchmark of the full interview flow against the local fake model.
+
+Simulates candidates concurrently, each generating a five-question plan, having its
+answers evaluated and getting a feedback report, with no network access:
+
+    python -m benchmark --candidates 50 --concurrency 10 --latency 0.2 --error-rate 0.05
+
+Reports throughput, p50/p95/p99 latency per stage, API calls made, the tier
+that scored each answer, injected failures and fallbacks. The evaluation cache defaults to an in-memory database
+so every run starts cold; --json writes the full results for comparison
+between runs.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from metrics import QUANTILES, Histogram
+
+
+STAGES = ("questions", "evaluation", "report", "total")
+
+# How candidates tend to open an answer
+ANSWER_OPENERS = (
+    "In my experience,",
+    "I think",
+    "What I usually do is, roughly:",
+    "From what I remember,"
+)
+
+# Remarks of their own that candidates add to an answer
+ANSWER_ASIDES = (
+    "then I'd double-check the result against a few rows by hand.",
+    "I'd keep a copy of the original data in case something goes wrong.",
+    "it depends a bit on how the sheet is laid out.",
+    "I picked this up on the job rather than in a course."
+)
+
+WEAK_ANSWERS = (
+    "I would use a formula for that.",
+    "I'm not sure, maybe sort the data first.",
+    "I don't know"
+)
+
+
+def recall_answer(reference: str, rng: random.Random, recall: float) -> str:
+    """
+    Answer in the candidate's own words: each word of the reference answer is recalled with
+    probability `recall`, wrapped in remarks of the candidate's own, so even strong answers
+    rarely match the reference closely enough to be scored without the model.
+    """
+    words = [word for word in reference.split() if rng.random() < recall]
+    return f"{rng.choice(ANSWER_OPENERS)} {' '.join(words)}, and {rng.choice(ANSWER_ASIDES)}"
+
+
+def simulate_candidate(index: int, seed: int, with_report: bool = True) -> Dict[str, float]:
+    """Run one interview end to end and return the seconds spent in each stage."""
+    from interviewer import (
+        choose_plan_topics,
+        evaluate_all_answers,
+        generate_final_report,
+        generate_interview_plan
+    )
+
+    rng = random.Random(seed * 100003 + index)
+    timings = {}
+    start = time.perf_counter()
+
+    questions_answers = []
+    plan = generate_interview_plan(choose_plan_topics())
+    for _, (question, reference_answer) in sorted(plan.items()):
+        draw = rng.random()
+        # Without a reference answer there is nothing to base a good answer on, so the candidate answers weakly
+        if reference_answer is None or draw >= 0.7:
+            answer = rng.choice(WEAK_ANSWERS)
+        elif draw < 0.4:
+            answer = recall_answer(reference_answer, rng, recall=0.7)
+        else:
+            # Half of the reference answer, partly recalled: only the model can grade it
+            words = reference_answer.split()
+            answer = recall_answer(" ".join(words[:max(1, len(words) // 2)]), rng, recall=0.6)
+        questions_answers.append({
+            'question': question, 'answer': answer, 'score': 0, 'explanation': '', 'reference_answer': reference_answer
+        })
+    skipped_questions = [i for i in range(5) if rng.random() < 0.1]
+    timings['questions'] = time.perf_counter() - start
+
+    stage_start = time.perf_counter()
+    evaluate_all_answers(questions_answers, skipped_questions)
+    timings['evaluation'] = time.perf_counter() - stage_start
+
+    stage_start = time.perf_counter()
+    if with_report:
+        generate_final_report(questions_answers)
+    timings['report'] = time.perf_counter() - stage_start
+
+    timings['total'] = time.perf_counter() - start
+    return timings
+
+
+def run_benchmark(candidates: int, concurrency: int, seed: int = 0, with_report: bool = True) -> Dict:
+    """Simulate `candidates` interviews, `concurrency` at a time, against the current backend."""
+    from metrics import registry
+    from model_backend import get_backend
+
+    histograms = {stage: Histogram(window=candidates) for stage in STAGES}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(simulate_candidate, i, seed, with_report) for i in range(candidates)]
+        for future in futures:
+            for stage, seconds in future.result().items():
+                histograms[stage].observe(seconds)
+    elapsed = time.perf_counter() - start
+
+    backend = get_backend()
+    snapshot = registry.snapshot()
+    api_calls = sum(series['count'] for series in snapshot['histograms'].get('llm_call_latency_seconds', []))
+    return {
+        'candidates': candidates,
+        'concurrency': concurrency,
+        'elapsed_seconds': elapsed,
+        'candidates_per_second': candidates / elapsed,
+        'api_calls_per_second': api_calls / elapsed,
+        'stages': {
+            stage: {f"p{int(q * 100)}": histogram.quantile(q) for q in QUANTILES}
+            for stage, histogram in histograms.items()
+        },
+        'backend': {
+            'calls': backend.calls,
+            'injected_errors': backend.errors,
+            'quota_rejections': backend.quota_rejections
+        },
+        'metrics': snapshot
+    }
+
+
+def print_summary(results: Dict) -> None:
+    print(f"{results['candidates']} candidates, {results['concurrency']} concurrent, "
+          f"{results['elapsed_seconds']:.2f}s")
+    print(f"throughput: {results['candidates_per_second']:.2f} candidates/s, "
+          f"{results['api_calls_per_second']:.2f} API calls/s")
+    print(f"{'stage':<12}" + "".join(f"{name:>10}" for name in ("p50", "p95", "p99")))
+    for stage, quantiles in results['stages'].items():
+        print(f"{stage:<12}" + "".join(f"{seconds:>9.3f}s" for seconds in quantiles.values()))
+    backend = results['backend']
+    print(f"backend calls: {backend['calls']} ({backend['injected_errors']} injected errors, "
+          f"{backend['quota_rejections']} quota rejections)")
+    for series in results['metrics']['histograms'].get('llm_call_latency_seconds', []):
+        print(f"  {series['labels']['call_site']:<18}{series['count']:>6} calls  p95 {series['p95']:.3f}s")
+    for series in results['metrics']['counters'].get('evaluation_tier_total', []):
+        print(f"  scored by {series['labels']['tier']}: {series['value']:g}")
+    for series in results['metrics']['counters'].get('llm_fallbacks_total', []):
+        labels = series['labels']
+        print(f"  fallback {labels['call_site']} ({labels['cause']}): {series['value']:g}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the interview flow against a local fake model.")
+    parser.add_argument("--candidates", type=int, default=20, help="interviews to simulate")
+    parser.add_argument("--concurrency", type=int, default=8, help="interviews running at once")
+    parser.add_argument("--latency", type=float, default=0.2, help="mean fake model latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of fake calls failing with HTTP 500")
+    parser.add_argument("--quota-per-minute", type=int, help="fake calls allowed per minute before HTTP 429")
+    parser.add_argument("--requests-per-minute", type=float, help="override the scheduler's rate limit")
+    parser.add_argument("--cache", default=":memory:", help="evaluation cache database (default: in memory)")
+    parser.add_argument("--no-report", action="store_true", help="skip generating the feedback report")
+    parser.add_argument("--seed", type=int, default=0, help="seed for simulated answers and injected failures")
+    parser.add_argument("--json", help="write the full results to this JSON file")
+    args = parser.parse_args(argv)
+
+    # These settings are read when the modules are first imported, so set them before that.
+    # The question pool's refill worker would add its own API calls to the totals, so it stays off.
+    os.environ["EVALUATION_CACHE_PATH"] = args.cache
+    os.environ["QUESTION_POOL_REFILL"] = "0"
+    if args.requests_per_minute:
+        os.environ["GEMINI_REQUESTS_PER_MINUTE"] = str(args.requests_per_minute)
+        os.environ["GEMINI_BURST"] = str(max(1.0, args.requests_per_minute / 6))
+
+    from model_backend import FakeBackend, set_backend
+    set_backend(FakeBackend(
+        latency_seconds=args.latency,
+        error_rate=args.error_rate,
+        quota_per_minute=args.quota_per_minute,
+        seed=args.seed
+    ))
+
+    results = run_benchmark(args.candidates, args.concurrency, seed=args.seed, with_report=not args.no_report)
+    print_summary(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
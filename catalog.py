@@ -0,0 +1,424 @@
+import re
+from types import MappingProxyType
+
+
+# Question and difficulty catalog shared by question generation, evaluation, the report and the UI.
+# Everything here is built once per process and is read-only.
+
+_DIFFICULTY_LEVELS = {
+    1: {
+        "level": "Basic",
+        "topics": ("Basic formulas", "Simple functions", "Data entry", "Basic formatting"),
+        "description": "Beginner Excel skills - basic formulas, simple functions, data entry",
+        "color": "🟢",
+        "thinking": "Let me start with fundamental Excel concepts..."
+    },
+    2: {
+        "level": "Intermediate-Basic",
+        "topics": ("VLOOKUP", "IF statements", "Basic pivot tables", "Data sorting"),
+        "description": "Intermediate Excel skills - lookup functions, conditional logic, basic analysis",
+        "color": "🟡",
+        "thinking": "Now I'll test your lookup and analysis skills..."
+    },
+    3: {
+        "level": "Intermediate",
+        "topics": ("INDEX/MATCH", "Pivot tables", "Data cleaning", "Charts"),
+        "description": "Intermediate Excel skills - advanced lookups, data analysis, visualization",
+        "color": "🟠",
+        "thinking": "Time to evaluate your data analysis capabilities..."
+    },
+    4: {
+        "level": "Advanced-Intermediate",
+        "topics": ("Array formulas", "Conditional formatting", "Data validation", "Advanced pivot tables"),
+        "description": "Advanced Excel skills - complex formulas, data validation, advanced analysis",
+        "color": "🔴",
+        "thinking": "Let's see how you handle complex formulas..."
+    },
+    5: {
+        "level": "Advanced",
+        "topics": ("Macros", "Financial functions", "Dashboard creation", "Advanced automation"),
+        "description": "Expert Excel skills - automation, complex analysis, professional dashboards",
+        "color": "🟣",
+        "thinking": "Final challenge - advanced automation and dashboards..."
+    }
+}
+
+DIFFICULTY_LEVELS = MappingProxyType({
+    number: MappingProxyType(info) for number, info in _DIFFICULTY_LEVELS.items()
+})
+
+# Shown when a question number has no entry in DIFFICULTY_LEVELS
+UNKNOWN_LEVEL = MappingProxyType({"level": "Unknown", "color": "⚪"})
+
+# (topic, question, reference answer) entries per difficulty level, used when no other question source is available
+_FALLBACK_QUESTIONS_BY_LEVEL = {
+    1: (
+        (
+            "Basic formulas",
+            "How would you calculate the total sales for a month using a SUM formula?",
+            "Enter =SUM(B2:B31) below the daily sales column, or select the cell under the range and use AutoSum (Alt+=). To total only one month from a longer list, use =SUMIFS(Sales,Date,\">=\"&DATE(2024,1,1),Date,\"<\"&DATE(2024,2,1))."
+        ),
+        (
+            "Simple functions",
+            "Explain how to use the AVERAGE function to find the average of a range of numbers.",
+            "Type =AVERAGE(A2:A20) to get the arithmetic mean of the range. AVERAGE ignores blank cells and text but includes zeros; use AVERAGEIF(A2:A20,\"<>0\") to leave zeros out, or AVERAGEIFS for multiple criteria."
+        ),
+        (
+            "Basic formatting",
+            "How would you format cells to display currency values with dollar signs?",
+            "Select the cells, press Ctrl+1 to open Format Cells, choose Currency or Accounting on the Number tab, pick the $ symbol and the number of decimal places. The Accounting format aligns the dollar signs; the value itself stays a number, so formulas still work."
+        ),
+        (
+            "Basic formulas",
+            "What is the difference between relative and absolute cell references in Excel?",
+            "A relative reference like A1 shifts when the formula is copied to another cell, while an absolute reference like $A$1 always points to the same cell. Mixed references ($A1 or A$1) lock only the column or the row. Press F4 to cycle through them, e.g. to keep a tax rate cell fixed while copying a formula down."
+        )
+    ),
+    2: (
+        (
+            "VLOOKUP",
+            "How would you use VLOOKUP to find the price of a product based on its ID?",
+            "Use =VLOOKUP(A2,Products!A:C,3,FALSE): the product ID to find, the table whose first column holds the IDs, the column number of the price, and FALSE for an exact match. Wrap it in IFERROR to show a message when the ID is missing."
+        ),
+        (
+            "IF statements",
+            "Explain how to use the IF function to categorize data into different performance levels.",
+            "IF tests a condition and returns one value when it is true and another when it is false. Nest IFs from the highest threshold down, e.g. =IF(B2>=90,\"Excellent\",IF(B2>=70,\"Good\",\"Needs Improvement\")), or use IFS to list the conditions without nesting."
+        ),
+        (
+            "Basic pivot tables",
+            "How would you create a basic pivot table to summarize sales data by region?",
+            "Select the data, choose Insert > PivotTable and place it on a new sheet. Drag Region to Rows and Sales to Values, where it is summed by default. Change the value field settings to average or count if needed, and refresh the pivot table when the source data changes."
+        ),
+        (
+            "Data sorting",
+            "How would you sort data by multiple columns in Excel?",
+            "Select the table and open Data > Sort. Add a level for each column in priority order, e.g. Region A to Z, then Sales largest to smallest, and tick My data has headers. The SORTBY function does the same with a formula in newer versions."
+        )
+    ),
+    3: (
+        (
+            "INDEX/MATCH",
+            "How would you use INDEX and MATCH functions together to perform a two-way lookup?",
+            "Use one MATCH to find the row and another to find the column, and pass both to INDEX: =INDEX(B2:E10,MATCH(H1,A2:A10,0),MATCH(H2,B1:E1,0)). The 0 forces exact matches, and unlike VLOOKUP it works whichever side the lookup column is on."
+        ),
+        (
+            "Data cleaning",
+            "Explain how to clean data with duplicate entries and inconsistent formatting.",
+            "Use TRIM to remove extra spaces, PROPER, UPPER or LOWER to fix text case, and Text to Columns or VALUE to convert numbers stored as text. Then remove duplicates with Data > Remove Duplicates, or flag them first with COUNTIF or conditional formatting. Power Query can repeat the same steps on new data."
+        ),
+        (
+            "Charts",
+            "How would you create a chart that automatically updates when new data is added?",
+            "Convert the data to a table with Ctrl+T and build the chart from the table; the chart range grows as rows are added. Alternatively define dynamic named ranges with OFFSET or INDEX and COUNTA and use them as the chart series."
+        ),
+        (
+            "Conditional formatting",
+            "How would you use conditional formatting to highlight cells based on specific criteria?",
+            "Select the range and choose Home > Conditional Formatting, then a built-in rule such as Greater Than or Top 10, or New Rule > Use a formula, e.g. =$C2>1000 to highlight whole rows. Manage Rules sets the order and the range each rule applies to."
+        )
+    ),
+    4: (
+        (
+            "Array formulas",
+            "How would you create an array formula to calculate the sum of values based on multiple conditions?",
+            "Multiply the conditions so they act as AND: =SUM((A2:A100=\"East\")*(B2:B100>500)*C2:C100), entered with Ctrl+Shift+Enter in older Excel or normally in Excel 365. SUMPRODUCT gives the same result without array entry, and SUMIFS is simpler when the conditions are plain comparisons."
+        ),
+        (
+            "Data validation",
+            "Explain how to set up data validation rules to ensure data integrity in Excel.",
+            "Select the cells and open Data > Data Validation. Allow a whole number, decimal, date or list (for a dropdown), set the limits, or use a custom formula such as =COUNTIF($A:$A,A2)=1 to block duplicates. Add an input message and an error alert, and use Circle Invalid Data to find existing bad entries."
+        ),
+        (
+            "Advanced pivot tables",
+            "How would you create a dynamic dashboard using pivot tables, slicers, and charts?",
+            "Load the data as a table, build pivot tables for each summary and pivot charts from them. Insert slicers and a timeline, and connect them to all pivot tables through Report Connections so one click filters the whole dashboard. Refresh All updates everything when the data changes."
+        ),
+        (
+            "Conditional formatting",
+            "How would you use advanced conditional formatting with custom formulas?",
+            "Choose New Rule > Use a formula and write a formula that is TRUE for the cells to format, relative to the top-left cell, e.g. =AND($B2>TODAY(),$C2=\"Open\") or =MOD(ROW(),2)=0 for banding. Anchor columns with $ so the rule applies across whole rows, and order rules with Stop If True."
+        )
+    ),
+    5: (
+        (
+            "Macros",
+            "How would you create a macro to automate repetitive data entry tasks?",
+            "Enable the Developer tab, use Record Macro while doing the task once (with relative references if it should work from any cell), then stop recording. Edit the VBA in the Visual Basic Editor to add loops or input checks, assign the macro to a button or shortcut, and save the workbook as .xlsm."
+        ),
+        (
+            "Financial functions",
+            "Explain how to use financial functions like PMT, FV, and NPV for loan calculations.",
+            "PMT(rate,nper,pv) gives the periodic loan payment, e.g. =PMT(5%/12,60,-20000) for a five-year loan; divide the annual rate and multiply the years by 12 for monthly periods. FV(rate,nper,pmt,pv) gives the future value of savings, and NPV(rate,cash flows) discounts future cash flows, with the initial investment added separately."
+        ),
+        (
+            "Dashboard creation",
+            "How would you build a comprehensive dashboard with multiple data sources and interactive elements?",
+            "Import and combine the sources with Power Query, relate them in the Data Model, and create measures for the KPIs. Build pivot tables and charts from the model, add slicers and timelines connected to all of them, and lay out the KPIs and charts on one sheet. Set the queries to refresh so the dashboard stays current."
+        ),
+        (
+            "Advanced automation",
+            "How would you implement advanced data analysis using Power Query and Power Pivot?",
+            "Use Power Query to connect to the sources and clean, merge and reshape the data in repeatable steps, then load it to the Data Model. In Power Pivot, define relationships between the tables and DAX measures such as CALCULATE and SUMX, and analyze them with pivot tables that refresh with the data."
+        )
+    )
+}
+
+# (question, reference answer) pairs per difficulty level
+FALLBACK_QUESTIONS_BY_LEVEL = MappingProxyType({
+    level: tuple((question, reference_answer) for _, question, reference_answer in questions)
+    for level, questions in _FALLBACK_QUESTIONS_BY_LEVEL.items()
+})
+
+# (level, topic, question, reference answer) entries a new question bank is seeded with;
+# near-duplicates are dropped on import
+BANK_SEED_QUESTIONS = tuple(
+    (level, topic, question, reference_answer)
+    for level, questions in _FALLBACK_QUESTIONS_BY_LEVEL.items()
+    for topic, question, reference_answer in questions
+) + (
+    (
+        2, "VLOOKUP",
+        "How would you use VLOOKUP to find the price of a product based on its ID, and what are the key parameters you need to consider?",
+        "=VLOOKUP(lookup_value,table_array,col_index_num,range_lookup): the ID, the table with IDs in its first column, the price column number, and FALSE for an exact match. Lock the table with absolute references, remember VLOOKUP only looks to the right, and handle missing IDs with IFERROR."
+    ),
+    (
+        3, "INDEX/MATCH",
+        "Explain the difference between VLOOKUP and INDEX/MATCH functions. When would you use each one?",
+        "VLOOKUP searches the first column of a table and returns a column by number, so it breaks when columns are inserted and can't look left. INDEX/MATCH looks up any column and returns from any other, is more robust and faster on large sheets. Use VLOOKUP for quick simple lookups and INDEX/MATCH (or XLOOKUP) otherwise."
+    ),
+    (
+        2, "Basic pivot tables",
+        "How would you create a pivot table to analyze sales data by region and product category?",
+        "Select the data and choose Insert > PivotTable. Drag Region to Rows, Product Category to Columns and Sales to Values to get summed sales for each combination. Add filters or slicers, and switch the value field to average or percentage of total as needed."
+    ),
+    (
+        3, "Data cleaning",
+        "Describe the process of cleaning data with duplicate entries and inconsistent formatting in Excel.",
+        "First copy the raw data, then standardize it: TRIM spaces, fix case with PROPER or UPPER, convert text numbers and dates, and use Find and Replace for inconsistent spellings. Identify duplicates with COUNTIF or conditional formatting and remove them with Data > Remove Duplicates on the key columns."
+    ),
+    (
+        4, "Conditional formatting",
+        "How would you use conditional formatting to highlight cells that meet multiple criteria simultaneously?",
+        "Use New Rule > Use a formula with AND or OR, e.g. =AND($B2=\"East\",$C2>1000), applied to the whole range with the column anchored by $. Pick a format, and use Manage Rules to check the range and the rule order."
+    ),
+    (
+        4, "Array formulas",
+        "Explain how to create an array formula that calculates the sum of values based on multiple conditions.",
+        "Build boolean arrays for each condition and multiply them with the values: =SUM((Region=\"East\")*(Month=\"Jan\")*Sales), confirmed with Ctrl+Shift+Enter in older versions. SUMPRODUCT avoids array entry, and adding the arrays instead of multiplying gives OR logic."
+    ),
+    (
+        2, "IF statements",
+        "How would you use the IF function with nested logic to categorize data into different performance levels?",
+        "Nest IF functions from the highest threshold down so each one handles the remaining cases: =IF(B2>=90,\"A\",IF(B2>=75,\"B\",IF(B2>=60,\"C\",\"D\"))). Combine conditions with AND or OR, and prefer IFS or a lookup table once there are many levels."
+    ),
+    (
+        5, "Dashboard creation",
+        "Describe how to create a dynamic dashboard using pivot tables, slicers, and charts.",
+        "Format the data as a table, create pivot tables for each metric and pivot charts from them, and place them on one dashboard sheet. Insert slicers and timelines and connect them to every pivot table through Report Connections, so filtering updates all charts. Refresh All picks up new data."
+    ),
+    (
+        3, "INDEX/MATCH",
+        "How would you use the INDEX and MATCH functions together to perform a two-way lookup?",
+        "=INDEX(data,MATCH(row_value,row_headers,0),MATCH(column_value,column_headers,0)): the first MATCH finds the row, the second the column, and INDEX returns the value where they cross. Use exact matching with 0 and absolute references for the ranges."
+    ),
+    (
+        4, "Data validation",
+        "Explain the process of creating data validation rules to ensure data integrity in Excel.",
+        "Select the input cells, open Data > Data Validation and choose the allowed type: list, whole number, decimal, date, text length or a custom formula. Set the limits or source range, add an input message and a stop error alert, and check existing data with Circle Invalid Data."
+    ),
+    (
+        5, "Financial functions",
+        "How would you use the PMT function to calculate monthly loan payments and what parameters are required?",
+        "=PMT(rate,nper,pv,[fv],[type]): the monthly rate (annual rate/12), the number of payments (years*12) and the loan amount. For example =PMT(6%/12,360,-250000) returns the monthly payment; the result is negative unless the loan amount is entered as negative."
+    ),
+    (
+        3, "Data cleaning",
+        "Describe how to use the CONCATENATE function and text functions to clean and format data.",
+        "Join text with CONCATENATE, CONCAT, TEXTJOIN or &, e.g. =TRIM(A2)&\" \"&PROPER(B2). Clean the parts with TRIM, CLEAN, PROPER, UPPER and SUBSTITUTE, extract pieces with LEFT, RIGHT, MID and FIND, and format numbers and dates inside text with TEXT."
+    ),
+    (
+        3, "Charts",
+        "How would you create a chart that automatically updates when new data is added to your worksheet?",
+        "Turn the data into an Excel table with Ctrl+T and insert the chart from it; new rows are included automatically. In older workbooks, use dynamic named ranges built with OFFSET and COUNTA as the series values."
+    ),
+    (
+        2, "IF statements",
+        "Explain how to use the SUMIFS function to sum values based on multiple criteria.",
+        "=SUMIFS(sum_range,criteria_range1,criteria1,criteria_range2,criteria2,...) adds the values in sum_range where every condition holds, e.g. =SUMIFS(C:C,A:A,\"East\",B:B,\">=\"&DATE(2024,1,1)). All ranges must be the same size, and criteria can use operators, wildcards and cell references."
+    ),
+    (
+        5, "Macros",
+        "How would you create a macro to automate repetitive tasks in Excel?",
+        "Show the Developer tab, click Record Macro, perform the steps once and stop recording. Review and generalize the recorded VBA in the editor, for example with loops and variables, assign the macro to a button or shortcut, and save the file as a macro-enabled .xlsm workbook."
+    )
+)
+
+# Sample model answers, used only as extra documents for fitting the similarity grader's term weights
+IDF_CORPUS = (
+    "To calculate the total cost, you would use the SUMPRODUCT function. In cell C7, the formula would be =SUMPRODUCT(A2:A6,B2:B6) which multiplies each item's price by its quantity and then adds all the results together.",
+    "To create a dynamic chart that updates automatically, you would: 1) Create a named range for your data (Ctrl+T or Insert > Table), 2) Insert a chart based on this table (Insert > Charts > desired chart type), 3) The chart will automatically update when data in the table changes. You can also use OFFSET or INDEX functions with COUNTA to create dynamic ranges.",
+    "To find the last value in column A, you can use: =LOOKUP(2,1/(A:A<>\"\"),A:A) or =INDEX(A:A,MATCH(9.99999999999999E+307,A:A)) or =INDEX(A:A,COUNTA(A:A)). These formulas work even when the data has blank cells or is unsorted.",
+    "To create a conditional formatting rule that highlights cells with values above average: 1) Select the range, 2) Go to Home > Conditional Formatting > New Rule, 3) Choose 'Use a formula', 4) Enter =A1>AVERAGE($A$1:$A$100) (adjust range as needed), 5) Click Format and choose highlighting style, 6) Click OK. This will highlight all cells with values above the average of the selected range.",
+    "To create a pivot table summarizing sales by region and product: 1) Select your data range, 2) Go to Insert > PivotTable, 3) In the PivotTable Fields pane, drag 'Region' to Rows area, 'Product' to Columns area, and 'Sales' to Values area, 4) The pivot table will automatically calculate the sum of sales for each region-product combination. You can then add filters, change calculation type (e.g., to average), or add additional fields as needed."
+)
+
+# Minimum percentage of available points for each skill level, highest first
+SKILL_BANDS = ((90, "Expert"), (75, "Advanced"), (60, "Intermediate"), (40, "Basic"), (0, "Beginner"))
+SKILL_BAND_ICONS = MappingProxyType({"Expert": "🌟", "Advanced": "✨", "Intermediate": "🔵", "Basic": "🟡", "Beginner": "🔴"})
+
+SCORE_CLASSES = MappingProxyType({0: "score-0", 1: "score-1", 2: "score-2"})
+SCORE_LABELS = MappingProxyType({0: "Needs Improvement", 1: "Good Understanding", 2: "Excellent Response"})
+
+_APP_CSS = """
+.main-header {
+    font-size: 2.5rem;
+    color: #1f77b4;
+    text-align: center;
+    margin-bottom: 2rem;
+}
+.question-box {
+    background-color: #2d3748;
+    color: #ffffff;
+    padding: 1.5rem;
+    border-radius: 10px;
+    border-left: 5px solid #1f77b4;
+    margin: 1rem 0;
+    border: 1px solid #4a5568;
+}
+.answer-box {
+    background-color: #2d3748;
+    color: #ffffff;
+    padding: 1rem;
+    border-radius: 8px;
+    margin: 1rem 0;
+    border: 1px solid #4a5568;
+}
+.score-box {
+    background-color: #2d3748;
+    color: #ffffff;
+    padding: 1rem;
+    border-radius: 8px;
+    margin: 1rem 0;
+    border: 1px solid #4a5568;
+}
+.report-box {
+    background-color: #2d3748;
+    color: #ffffff;
+    padding: 2rem;
+    border-radius: 10px;
+    border: 2px solid #1f77b4;
+    margin: 2rem 0;
+    box-shadow: 0 6px 12px rgba(0, 0, 0, 0.2);
+}
+.agent-message {
+    background-color: #1e3a8a;
+    color: #ffffff;
+    padding: 1rem;
+    border-radius: 8px;
+    margin: 1rem 0;
+    border-left: 4px solid #3b82f6;
+}
+.submit-all-btn {
+    background-color: #1f77b4;
+    color: white;
+    font-weight: bold;
+    padding: 0.75rem;
+    border-radius: 8px;
+    text-align: center;
+    margin: 1rem 0;
+    cursor: pointer;
+}
+.stButton>button {
+    transition: all 0.3s ease;
+}
+.stButton>button:hover {
+    background-color: #45a049;
+    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
+}
+.submit-all-button button {
+    background-color: #2196F3 !important;
+    color: white !important;
+    font-weight: bold !important;
+    font-size: 1.1rem !important;
+    padding: 0.5rem 1rem !important;
+    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1) !important;
+}
+.submit-all-button button:hover {
+    background-color: #0b7dda !important;
+    box-shadow: 0 6px 10px rgba(0, 0, 0, 0.2) !important;
+}
+.question-item {
+    border-bottom: 1px solid #4a5568;
+    padding-bottom: 15px;
+    margin-bottom: 15px;
+}
+.question-text {
+    font-weight: 600;
+    color: #e2e8f0;
+    margin-bottom: 10px;
+}
+.user-answer {
+    background-color: #1a202c;
+    padding: 10px;
+    border-radius: 5px;
+    margin-bottom: 10px;
+    border-left: 3px solid #4a5568;
+}
+.correct-answer {
+    background-color: #1a3e2c;
+    padding: 10px;
+    border-radius: 5px;
+    border-left: 4px solid #4caf50;
+    margin-bottom: 10px;
+}
+.score-indicator {
+    font-weight: bold;
+    padding: 3px 8px;
+    border-radius: 12px;
+    display: inline-block;
+    margin-left: 10px;
+}
+.score-0 {
+    background-color: #5c1e1e;
+    color: #ff8a8a;
+}
+.score-1 {
+    background-color: #5c4d1e;
+    color: #ffd78a;
+}
+.score-2 {
+    background-color: #1e5c2f;
+    color: #8aff8a;
+}
+.report-section {
+    margin-bottom: 20px;
+    border-left: 3px solid #3b82f6;
+    padding-left: 15px;
+}
+.report-section h3 {
+    border-bottom: 2px solid #3b82f6;
+    padding-bottom: 5px;
+    color: #e2e8f0;
+}
+.report-summary {
+    background-color: #1e3a5a;
+    padding: 15px;
+    border-radius: 8px;
+    margin-bottom: 20px;
+}
+.marked-review {
+    border-left: 4px solid #ff9800;
+    padding-left: 10px;
+    background-color: #3d3223;
+}
+"""
+
+
+def _minify_css(css: str) -> str:
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};,>])\s*", r"\1", css).strip()
+
+
+# The page stylesheet, minified once at import
+APP_STYLE = "<style>" + _minify_css(_APP_CSS) + "</style>"
@@ -0,0 +1,126 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+EVALUATION_CACHE_PATH = os.environ.get("EVALUATION_CACHE_PATH", "evaluation_cache.db")
+EVALUATION_CACHE_MAX_ENTRIES = int(os.environ.get("EVALUATION_CACHE_MAX_ENTRIES", "50000"))
+EVALUATION_CACHE_TTL_SECONDS = int(os.environ.get("EVALUATION_CACHE_TTL_SECONDS", str(30 * 24 * 60 * 60)))
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so trivially different answers share a cache entry."""
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+class EvaluationCache:
+    """
+    On-disk cache of answer evaluations, shared by every session and process using the same file.
+
+    Entries are keyed by a SHA-256 hash of the normalized question and answer. Entries
+    older than ttl_seconds are ignored and purged; once the cache holds more than
+    max_entries, the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 50000,
+        ttl_seconds: float = 30 * 24 * 60 * 60,
+        prune_interval: int = 100
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.prune_interval = prune_interval
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS evaluations (
+                    key TEXT PRIMARY KEY,
+                    score INTEGER NOT NULL,
+                    explanation TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS evaluations_last_used ON evaluations (last_used)")
+
+    @staticmethod
+    def make_key(question: str, answer: str) -> str:
+        """Hash the normalized question and answer into a cache key."""
+        payload = normalize_text(question) + "\x1f" + normalize_text(answer)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, question: str, answer: str) -> Optional[Tuple[int, str]]:
+        """Return the cached (score, explanation), or None on a miss."""
+        key = self.make_key(question, answer)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT score, explanation FROM evaluations WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE evaluations SET last_used = ? WHERE key = ?", (now, key))
+        return row[0], row[1]
+
+    def put(self, question: str, answer: str, score: int, explanation: str) -> None:
+        """Store an evaluation; every prune_interval writes, expired and least recently used entries are evicted."""
+        key = self.make_key(question, answer)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO evaluations (key, score, explanation, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, score, explanation, now, now)
+            )
+            self._writes += 1
+            if self._writes % self.prune_interval != 0:
+                return
+            self._conn.execute("DELETE FROM evaluations WHERE created_at <= ?", (now - self.ttl_seconds,))
+            self._conn.execute(
+                "DELETE FROM evaluations WHERE key IN "
+                "(SELECT key FROM evaluations ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters for this process and the current number of entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": entries
+        }
+
+
+_cache: Optional[EvaluationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_evaluation_cache() -> EvaluationCache:
+    """Return the process-wide evaluation cache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EvaluationCache(
+                EVALUATION_CACHE_PATH,
+                max_entries=EVALUATION_CACHE_MAX_ENTRIES,
+                ttl_seconds=EVALUATION_CACHE_TTL_SECONDS
+            )
+        return _cache
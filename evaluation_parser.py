@@ -0,0 +1,232 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Response schemas for the model's structured (JSON) output mode
+EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer"},
+        "explanation": {"type": "string"}
+    },
+    "required": ["score", "explanation"]
+}
+
+BATCH_EVALUATION_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer"},
+            "score": {"type": "integer"},
+            "explanation": {"type": "string"}
+        },
+        "required": ["id", "score", "explanation"]
+    }
+}
+
+QUESTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "question": {"type": "string"},
+        "reference_answer": {"type": "string"}
+    },
+    "required": ["question", "reference_answer"]
+}
+
+INTERVIEW_PLAN_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "level": {"type": "integer"},
+            "question": {"type": "string"},
+            "reference_answer": {"type": "string"}
+        },
+        "required": ["level", "question", "reference_answer"]
+    }
+}
+
+_decoder = json.JSONDecoder()
+_FENCE = re.compile(r"^\s*```[a-zA-Z]*\s*|\s*```\s*$")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"'})
+# "Score: 2", "**Score:** 2/2" or "score = 1"; only the first digit after the label counts
+_SCORE_LINE = re.compile(r"^[\s*#-]*score\**\s*[:=]\s*\**\s*(\d+)(?!\.\d)", re.IGNORECASE | re.MULTILINE)
+_EXPLANATION_LINE = re.compile(r"^[\s*#-]*explanation\**\s*[:=]\s*\**\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+# The same fields in a JSON object too damaged to decode, e.g. cut off mid-explanation
+_JSON_SCORE = re.compile(r'"score"\s*:\s*"?(\d+)(?!\.\d)')
+_JSON_EXPLANATION = re.compile(r'"explanation"\s*:\s*"((?:[^"\\]|\\.)*)')
+
+
+def validate_score(value: Any) -> Optional[int]:
+    """Return the score as an int if it is a valid 0-2 score ("2", 2.0 and "2/2" included), else None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        value = value.strip().split('/')[0].strip()
+    try:
+        score = int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return score if score in (0, 1, 2) and score == float(value) else None
+
+
+def _explanation(value: Any) -> str:
+    explanation = str(value).strip() if value is not None else ""
+    return explanation or "No explanation provided"
+
+
+def _repair(text: str) -> str:
+    """Undo the usual drift around JSON output: code fences, curly quotes and trailing commas."""
+    text = _FENCE.sub("", text.translate(_SMART_QUOTES))
+    return _TRAILING_COMMA.sub(r"\1", text)
+
+
+def _decode_from(text: str, opening: str) -> Any:
+    """Decode the first JSON value starting at `opening`, ignoring any text around it."""
+    start = text.find(opening)
+    if start == -1:
+        raise ValueError(f"no {opening!r} in response")
+    return _decoder.raw_decode(text, start)[0]
+
+
+def _complete_items(text: str) -> List[Any]:
+    """
+    Recover the complete objects of a JSON array that was cut off, e.g. by the
+    output token limit. Decoding stops at the first object that does not parse.
+    """
+    start = text.find('[')
+    if start == -1:
+        return []
+    items = []
+    position = start + 1
+    while True:
+        while position < len(text) and text[position] in " \t\r\n,":
+            position += 1
+        if position >= len(text) or text[position] != '{':
+            return items
+        try:
+            item, position = _decoder.raw_decode(text, position)
+        except ValueError:
+            return items
+        items.append(item)
+
+
+def load_json(text: str, opening: str) -> Tuple[Any, bool]:
+    """
+    Decode a JSON object (opening "{") or array (opening "[") from a model response.
+
+    Structured output is plain JSON and decodes in one pass. Otherwise the value
+    is looked for inside the text, after a local repair if needed; truncated
+    arrays keep their complete items. Returns (value, repaired), with value None
+    if nothing could be decoded.
+    """
+    try:
+        return json.loads(text), False
+    except ValueError:
+        pass
+    repaired = _repair(text)
+    try:
+        return _decode_from(repaired, opening), True
+    except ValueError:
+        pass
+    if opening == '[':
+        items = _complete_items(repaired)
+        if items:
+            return items, True
+    return None, True
+
+
+def parse_evaluation(text: str) -> Tuple[Optional[Tuple[int, str]], bool]:
+    """
+    Parse a single evaluation into (score, explanation).
+
+    Accepts the JSON object of the structured mode and, as a last resort, the
+    fields of a damaged object or the "Score: n / Explanation: ..." lines of a
+    free-text reply. Returns
+    (result, repaired), with result None if no valid score was found.
+    """
+    value, repaired = load_json(text, '{')
+    if isinstance(value, list) and value:
+        value = value[0]
+    if isinstance(value, dict):
+        score = validate_score(value.get('score'))
+        if score is not None:
+            return (score, _explanation(value.get('explanation'))), repaired
+
+    score_match = _JSON_SCORE.search(text) or _SCORE_LINE.search(text)
+    if score_match is None or validate_score(score_match.group(1)) is None:
+        return None, True
+    explanation_match = _JSON_EXPLANATION.search(text) or _EXPLANATION_LINE.search(text)
+    explanation = explanation_match.group(1).strip().strip('*"') if explanation_match else None
+    return (int(score_match.group(1)), _explanation(explanation)), True
+
+
+def parse_batch_evaluation(text: str, count: int) -> Tuple[Dict[int, Tuple[int, str]], bool]:
+    """
+    Parse a batch evaluation into ({pair index: (score, explanation)}, repaired).
+
+    Entries with a missing or out-of-range id or score are dropped, as are
+    repeated ids, so the result may be partial.
+    """
+    items, repaired = load_json(text, '[')
+    if isinstance(items, dict):
+        items = [items]
+    results = {}
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get('id')) - 1
+        except (TypeError, ValueError):
+            continue
+        score = validate_score(item.get('score'))
+        if 0 <= index < count and score is not None and index not in results:
+            results[index] = (score, _explanation(item.get('explanation')))
+    return results, repaired
+
+
+def _reference_answer(value: Any) -> Optional[str]:
+    return (str(value).strip() or None) if value is not None else None
+
+
+def parse_generated_question(text: str) -> Tuple[Optional[Tuple[str, Optional[str]]], bool]:
+    """
+    Parse a generated question into ((question, reference answer), repaired).
+
+    A reply that is not JSON at all is taken as the bare question, without a
+    reference answer. Returns (None, True) if no question could be read.
+    """
+    value, repaired = load_json(text, '{')
+    if isinstance(value, dict):
+        question = str(value.get('question') or "").strip()
+        if question:
+            return (question, _reference_answer(value.get('reference_answer'))), repaired
+        return None, True
+    if '{' in text or not text.strip():
+        return None, True
+    return (text.strip(), None), True
+
+
+def parse_interview_plan(text: str, levels: List[int]) -> Tuple[Dict[int, Tuple[str, Optional[str]]], bool]:
+    """
+    Parse an interview plan into ({level: (question, reference answer)}, repaired).
+
+    Slots for other levels, repeated levels and empty questions are dropped, so
+    the result may be partial.
+    """
+    items, repaired = load_json(text, '[')
+    results = {}
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            level = int(item.get('level'))
+        except (TypeError, ValueError):
+            continue
+        question = str(item.get('question') or "").strip()
+        if level in levels and question and level not in results:
+            results[level] = (question, _reference_answer(item.get('reference_answer')))
+    return results, repaired
@@ -0,0 +1,199 @@
+"""
+Headless bulk grader for archived interview transcripts.
+
+Reads transcripts as JSON lines, scores every answer with the same evaluation
+logic as the app, and writes one scored JSON line per input line, in input order:
+
+    python -m grade transcripts.jsonl -o scored.jsonl --workers 8
+
+Each input line is an object with a "questions_answers" list of
+{"question", "answer"} entries and an optional "skipped_questions" list of
+indices; other fields are passed through. Only a bounded window of transcripts
+is held in memory. Progress is checkpointed next to the output file, so
+re-running the same command after an interruption resumes where it stopped.
+With --metrics-out, API latency percentiles, token counts, errors, fallbacks
+and cache hit ratios for the run are written as JSON when it finishes.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Iterator, Optional, TextIO, Tuple
+
+from interviewer import (
+    evaluate_all_answers,
+    generate_final_report,
+    local_fallback_scores,
+    reference_answer_for,
+    summarize_scores
+)
+from metrics import registry
+
+
+def read_transcripts(path: str, skip: int) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, raw line) for every non-blank input line after the first `skip` lines."""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line_number, line in enumerate(stream, 1):
+            if line_number > skip and line.strip():
+                yield line_number, line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def grade_transcript(line: str, offline: bool = False, with_report: bool = False) -> Dict:
+    """
+    Score one transcript line and return the scored record.
+    Previous scores are discarded so every answer is re-evaluated.
+    """
+    record = json.loads(line)
+    questions_answers = [
+        {
+            'question': qa.get('question', ''),
+            'answer': qa.get('answer', ''),
+            'score': 0,
+            'explanation': '',
+            'difficulty_level': qa.get('difficulty_level', i),
+            'reference_answer': qa.get('reference_answer') or reference_answer_for(qa.get('question', ''))
+        }
+        for i, qa in enumerate(record['questions_answers'], 1)
+    ]
+    skipped_questions = record.get('skipped_questions', [])
+
+    if offline:
+        scores = local_fallback_scores(
+            [(qa['question'], qa['answer']) for qa in questions_answers],
+            [qa['reference_answer'] for qa in questions_answers]
+        )
+        for qa, (score, explanation) in zip(questions_answers, scores):
+            qa['score'], qa['explanation'], qa['evaluation_tier'] = score, explanation, 'fallback'
+        for i in skipped_questions:
+            if 0 <= i < len(questions_answers):
+                qa = questions_answers[i]
+                qa['score'], qa['explanation'], qa['evaluation_tier'] = 0, 'Question was skipped', 'skipped'
+    else:
+        evaluate_all_answers(questions_answers, skipped_questions)
+
+    total_score, percentage, skill_level = summarize_scores(questions_answers)
+    record['questions_answers'] = questions_answers
+    record['total_score'] = total_score
+    record['percentage'] = percentage
+    record['skill_level'] = skill_level
+    if with_report:
+        record['report'] = generate_final_report(questions_answers)
+    return record
+
+
+def load_checkpoint(path: str) -> Tuple[int, int]:
+    """Return (input lines done, output bytes written) from a checkpoint file, or zeros."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        return checkpoint['lines_done'], checkpoint['output_bytes']
+    except FileNotFoundError:
+        return 0, 0
+
+
+def save_checkpoint(path: str, lines_done: int, output_bytes: int) -> None:
+    """Atomically record progress so a crash never leaves a half-written checkpoint."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({'lines_done': lines_done, 'output_bytes': output_bytes}, f)
+    os.replace(temp_path, path)
+
+
+def write_result(output: TextIO, line_number: int, future: Future) -> None:
+    try:
+        record = future.result()
+    except Exception as e:
+        # A malformed line is reported in place instead of aborting the run
+        record = {'line': line_number, 'error': f"{type(e).__name__}: {e}"}
+    output.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def grade_file(
+    input_path: str,
+    output_path: str,
+    workers: int = 4,
+    offline: bool = False,
+    with_report: bool = False,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_every: int = 50
+) -> int:
+    """
+    Grade every transcript in input_path into output_path and return the number graded.
+
+    Up to `workers` transcripts are evaluated at once; results are written in input
+    order, and at most 2 * workers transcripts are in flight at any time.
+    """
+    checkpoint_path = checkpoint_path or output_path + ".checkpoint"
+    lines_done, output_bytes = load_checkpoint(checkpoint_path)
+
+    # Drop anything written after the last checkpoint; those lines are graded again
+    with open(output_path, "a", encoding="utf-8") as output:
+        output.truncate(output_bytes)
+
+    graded = 0
+    window: Deque[Tuple[int, Future]] = deque()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    with open(output_path, "a", encoding="utf-8") as output:
+        def drain_one():
+            nonlocal lines_done, graded
+            line_number, future = window.popleft()
+            write_result(output, line_number, future)
+            lines_done = line_number
+            graded += 1
+            if graded % checkpoint_every == 0:
+                output.flush()
+                save_checkpoint(checkpoint_path, lines_done, output.tell())
+
+        for line_number, line in read_transcripts(input_path, lines_done):
+            window.append((line_number, executor.submit(grade_transcript, line, offline, with_report)))
+            if len(window) >= 2 * workers:
+                drain_one()
+        while window:
+            drain_one()
+
+        output.flush()
+        save_checkpoint(checkpoint_path, lines_done, output.tell())
+
+    executor.shutdown()
+    return graded
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-grade archived interview transcripts without the UI.")
+    parser.add_argument("input", help="JSONL file of transcripts, or - for stdin")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file to write scored transcripts to")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="transcripts evaluated concurrently")
+    parser.add_argument("--offline", action="store_true", help="score locally (reference answer similarity, else keywords), no API calls")
+    parser.add_argument("--with-report", action="store_true", help="also generate the feedback report for each transcript")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: OUTPUT.checkpoint)")
+    parser.add_argument("--checkpoint-every", type=int, default=50, help="transcripts between checkpoints")
+    parser.add_argument("--metrics-out", help="write API and cache metrics for the run to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.input == "-" and os.path.exists(args.checkpoint or args.output + ".checkpoint"):
+        parser.error("cannot resume from a checkpoint when reading stdin")
+
+    graded = grade_file(
+        args.input,
+        args.output,
+        workers=args.workers,
+        offline=args.offline,
+        with_report=args.with_report,
+        checkpoint_path=args.checkpoint,
+        checkpoint_every=args.checkpoint_every
+    )
+    print(f"Graded {graded} transcripts into {args.output}", file=sys.stderr)
+    if args.metrics_out:
+        with open(args.metrics_out, "w", encoding="utf-8") as f:
+            json.dump(registry.snapshot(), f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,908 @@
+import json
+import hashlib
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from catalog import DIFFICULTY_LEVELS, FALLBACK_QUESTIONS_BY_LEVEL, SKILL_BANDS
+from evaluation_cache import get_evaluation_cache
+from evaluation_parser import (
+    BATCH_EVALUATION_SCHEMA,
+    EVALUATION_SCHEMA,
+    INTERVIEW_PLAN_SCHEMA,
+    QUESTION_SCHEMA,
+    parse_batch_evaluation,
+    parse_evaluation,
+    parse_generated_question,
+    parse_interview_plan
+)
+from keyword_scorer import KeywordMatch, match_keywords, match_keywords_batch
+import metrics
+from model_backend import ModelResponse, get_backend
+from prompts import BATCH_EVALUATION_PROMPT, EVALUATION_PROMPT, INTERVIEW_PLAN_PROMPT, QUESTION_PROMPT, REPORT_PROMPT
+from question_index import QuestionIndex, near_duplicate, shingles
+from question_bank import get_question_bank
+from question_pool import QuestionPool
+from request_scheduler import Priority, get_scheduler
+from similarity_grader import get_similarity_grader, score_for_similarity
+
+
+# Answers are evaluated concurrently; a call that exceeds the timeout is scored locally.
+EVALUATION_TIMEOUT_SECONDS = 20
+MAX_EVALUATION_WORKERS = 5
+
+# Score all pending answers in one structured request; malformed entries are re-evaluated individually
+BATCH_EVALUATION = True
+BATCH_EVALUATION_TIMEOUT_SECONDS = 40
+BATCH_EVALUATION_TOKENS_PER_ANSWER = 120
+
+# Ask the model for JSON matching a response schema when scoring answers, instead of free text
+STRUCTURED_EVALUATION = True
+
+# Pre-generated questions per (level, topic); a bucket below the low-water mark is refilled to capacity
+QUESTION_POOL_LOW_WATER_MARK = 1
+QUESTION_POOL_CAPACITY = 3
+QUESTION_POOL_MAX_AGE_SECONDS = 6 * 60 * 60
+# Set QUESTION_POOL_REFILL=0 to never generate questions in the background, e.g. when benchmarking
+QUESTION_POOL_REFILL = os.environ.get("QUESTION_POOL_REFILL", "1") == "1"
+
+# Output tokens allowed per question when the whole interview plan is generated in one request
+INTERVIEW_PLAN_TOKENS_PER_QUESTION = 300
+
+# Question bank draws tried before settling for a near-duplicate of an asked question
+FALLBACK_DRAW_ATTEMPTS = 3
+
+# Answers shorter than this (in characters, ignoring surrounding whitespace) score 0 without being evaluated
+BRIEF_ANSWER_CHARS = 20
+
+# Settle clear-cut answers with local scorers before asking the model. An answer is scored
+# locally if it is blank or brief, or if its similarity to the reference answer is at least
+# the accept threshold (full credit) or below the reject threshold (no credit). Answers to
+# questions without a reference answer always go to the model.
+CASCADE_EVALUATION = os.environ.get("CASCADE_EVALUATION", "1") == "1"
+CASCADE_ACCEPT_SIMILARITY = float(os.environ.get("CASCADE_ACCEPT_SIMILARITY", "0.8"))
+CASCADE_REJECT_SIMILARITY = float(os.environ.get("CASCADE_REJECT_SIMILARITY", "0.05"))
+
+# Cause of the most recent failed API call on each thread, used to attribute fallbacks
+_call_state = threading.local()
+
+def classify_error(error: Exception) -> str:
+    """
+    Bucket an API exception as "quota", "timeout" or "error" for the metrics.
+    """
+    code = getattr(error, "code", None)
+    name = type(error).__name__
+    if code == 429 or name == "ResourceExhausted":
+        return "quota"
+    if code == 504 or name in ("DeadlineExceeded", "TimeoutError", "ReadTimeout"):
+        return "timeout"
+    return "error"
+
+def record_failure(call_site: str, cause: str):
+    """
+    Count a failed or unusable API response and remember its cause for this thread.
+    """
+    metrics.increment("llm_errors_total", call_site=call_site, cause=cause)
+    _call_state.last_failure = cause
+
+def record_fallback(call_site: str, cause: Optional[str] = None, count: int = 1):
+    """
+    Count answers or pages served by a local fallback instead of the API.
+    Without an explicit cause, the last failure on this thread is used.
+    """
+    cause = cause or getattr(_call_state, "last_failure", None) or "error"
+    metrics.increment("llm_fallbacks_total", count, call_site=call_site, cause=cause)
+
+def record_token_usage(call_site: str, response: ModelResponse):
+    """
+    Add the prompt and completion token counts reported by the model to the metrics.
+    """
+    metrics.increment("llm_prompt_tokens_total", response.prompt_tokens, call_site=call_site)
+    metrics.increment("llm_completion_tokens_total", response.completion_tokens, call_site=call_site)
+
+def record_tier(tier: str, count: int = 1):
+    """
+    Count answers scored by an evaluation tier (blank, brief, similarity, cache, llm or fallback).
+    """
+    if count:
+        metrics.increment("evaluation_tier_total", count, tier=tier)
+
+def record_repair(call_site: str):
+    """
+    Count a response that only parsed after a local repair, e.g. JSON wrapped in text or cut off.
+    """
+    metrics.increment("llm_output_repairs_total", call_site=call_site)
+
+def call_gemini_api(
+    prompt: str,
+    max_length: int = 500,
+    timeout: Optional[float] = None,
+    priority: Priority = Priority.QUESTION,
+    call_site: str = "question",
+    response_schema: Optional[Dict] = None
+) -> str:
+    """
+    Call Google Gemini API for question generation and evaluation.
+    
+    Requests go through the process-wide scheduler, which rate-limits them,
+    orders them by priority and retries quota errors with backoff. Latency
+    (including queueing), token usage and failures are recorded per call site.
+    With a response schema the model is asked for JSON output matching it.
+    """
+    def request():
+        return get_backend().generate(
+            prompt,
+            max_output_tokens=max_length,
+            temperature=0.7,
+            timeout=timeout,
+            response_schema=response_schema
+        )
+    
+    start = time.perf_counter()
+    try:
+        response = get_scheduler().run(request, priority)
+        text = response.text.strip()
+    
+    except Exception as e:
+        record_failure(call_site, classify_error(e))
+        return None
+    
+    finally:
+        metrics.observe("llm_call_latency_seconds", time.perf_counter() - start, call_site=call_site)
+    
+    record_token_usage(call_site, response)
+    _call_state.last_failure = None
+    return text
+
+class StreamInterrupted(Exception):
+    """Raised when a streamed response fails after part of it was already yielded."""
+
+def stream_gemini_api(
+    prompt: str,
+    max_length: int = 500,
+    priority: Priority = Priority.REPORT,
+    call_site: str = "report_stream"
+) -> Iterator[str]:
+    """
+    Call Google Gemini API with streaming enabled, yielding text chunks as they arrive.
+    The request holds a scheduler slot until the stream ends. If the request fails
+    before any text arrived the stream simply ends; if it fails partway through,
+    StreamInterrupted is raised so the partial text isn't taken for a whole response.
+    """
+    start = time.perf_counter()
+    last_chunk = None
+    try:
+        with get_scheduler().slot(priority):
+            for chunk in get_backend().stream(prompt, max_output_tokens=max_length, temperature=0.7):
+                if last_chunk is None:
+                    metrics.observe("llm_time_to_first_chunk_seconds", time.perf_counter() - start, call_site=call_site)
+                last_chunk = chunk
+                yield chunk.text
+        if last_chunk is not None:
+            record_token_usage(call_site, last_chunk)
+        _call_state.last_failure = None
+    
+    except Exception as e:
+        record_failure(call_site, classify_error(e))
+        if last_chunk is not None:
+            raise StreamInterrupted(str(e)) from e
+        return
+    
+    finally:
+        metrics.observe("llm_call_latency_seconds", time.perf_counter() - start, call_site=call_site)
+
+def generate_question_for_topic(
+    question_number: int,
+    topic: str,
+    priority: Priority = Priority.QUESTION,
+    call_site: str = "question"
+) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Ask Google Gemini for a question at the given difficulty level about a specific topic.
+    Returns (question, reference answer), both from the same request, or None when
+    the API is unavailable.
+    """
+    current_level = DIFFICULTY_LEVELS[question_number]
+    
+    prompt = QUESTION_PROMPT.render(level=current_level['level'], topic=topic, description=current_level['description'])
+    
+    response = call_gemini_api(
+        prompt, max_length=400, priority=priority, call_site=call_site, response_schema=QUESTION_SCHEMA
+    )
+    
+    if response is None:
+        return None
+    result, repaired = parse_generated_question(response)
+    if result is None or "Error" in result[0]:
+        record_failure(call_site, "parse_failure")
+        return None
+    if repaired:
+        record_repair(call_site)
+    
+    return result
+
+def reference_answer_for(question: str) -> Optional[str]:
+    """
+    Return the reference answer the question bank stores for a question, or None if it has none.
+    """
+    try:
+        return get_question_bank().reference_answer(question)
+    except sqlite3.Error:
+        metrics.increment("question_bank_errors_total")
+        return None
+
+def cached_evaluation(question: str, answer: str) -> Optional[Tuple[int, str]]:
+    """
+    Look up an evaluation in the shared cache. A database error, such as the file being
+    locked by another process, counts as a miss.
+    """
+    try:
+        return get_evaluation_cache().get(question, answer)
+    except sqlite3.Error:
+        metrics.increment("evaluation_cache_errors_total", operation="get")
+        return None
+
+def cache_evaluation(question: str, answer: str, score: int, explanation: str) -> None:
+    """Store an evaluation in the shared cache, skipping the write on a database error."""
+    try:
+        get_evaluation_cache().put(question, answer, score, explanation)
+    except sqlite3.Error:
+        metrics.increment("evaluation_cache_errors_total", operation="put")
+
+_question_pool: Optional[QuestionPool] = None
+_question_pool_lock = threading.Lock()
+
+def get_question_pool() -> QuestionPool:
+    """
+    Return the process-wide question pool shared by all sessions, starting its refill worker on
+    first use unless QUESTION_POOL_REFILL is off.
+    """
+    global _question_pool
+    with _question_pool_lock:
+        if _question_pool is not None:
+            return _question_pool
+        pool = QuestionPool(
+            partial(generate_question_for_topic, priority=Priority.PREFETCH, call_site="question_pool"),
+            {level: info["topics"] for level, info in DIFFICULTY_LEVELS.items()},
+            low_water_mark=QUESTION_POOL_LOW_WATER_MARK,
+            capacity=QUESTION_POOL_CAPACITY,
+            max_age_seconds=QUESTION_POOL_MAX_AGE_SECONDS,
+            # Served questions are forgotten as pooled ones expire, so they don't block new questions forever
+            index=QuestionIndex(max_age_seconds=QUESTION_POOL_MAX_AGE_SECONDS)
+        )
+        if QUESTION_POOL_REFILL:
+            pool.start()
+        _question_pool = pool
+        return pool
+
+def collect_cache_metrics() -> List[Tuple[str, Dict[str, str], float]]:
+    """
+    Report hit counts and ratios of the shared evaluation cache and question pool.
+    """
+    stats = get_evaluation_cache().stats()
+    samples = [
+        ("evaluation_cache_hits", {}, stats["hits"]),
+        ("evaluation_cache_misses", {}, stats["misses"]),
+        ("evaluation_cache_hit_ratio", {}, stats["hit_ratio"]),
+        ("evaluation_cache_entries", {}, stats["entries"])
+    ]
+    if _question_pool is not None:
+        lookups = _question_pool.hits + _question_pool.misses
+        samples += [
+            ("question_pool_hits", {}, _question_pool.hits),
+            ("question_pool_misses", {}, _question_pool.misses),
+            ("question_pool_hit_ratio", {}, _question_pool.hits / lookups if lookups else 0.0),
+            ("question_pool_rejected_duplicates", {}, _question_pool.rejected)
+        ]
+    return samples
+
+metrics.registry.register_collector(collect_cache_metrics)
+
+def generate_excel_question(
+    question_number: int,
+    topic: Optional[str] = None,
+    avoid: Sequence[str] = (),
+    seed: Optional[int] = None
+) -> Tuple[str, Optional[str]]:
+    """
+    Generate an Excel interview question with progressive difficulty using Google Gemini,
+    returning (question, reference answer).
+    
+    The question number is the difficulty level; a random topic of that level is
+    used unless one is given. Questions are served from the pre-generated pool when
+    possible; on a pool miss the question is generated live, and the question bank
+    is used if that fails. Near-duplicates of the questions in `avoid` (those
+    already asked in the interview) are never returned.
+    """
+    topic = topic or random.choice(DIFFICULTY_LEVELS[question_number]["topics"])
+    
+    pool = get_question_pool()
+    ai_question = pool.get(question_number, topic, reject=partial(near_duplicate, others=avoid) if avoid else None)
+    if ai_question is None:
+        ai_question = generate_question_for_topic(question_number, topic)
+        if ai_question is not None:
+            # Indexing it keeps the pool from filling up with paraphrases of it later
+            pool.index.add(ai_question[0])
+            if near_duplicate(ai_question[0], avoid):
+                record_fallback("question", "duplicate")
+                return get_fallback_question_by_difficulty(question_number, avoid, topic, seed)
+    
+    if ai_question is None:
+        record_fallback("question")
+        return get_fallback_question_by_difficulty(question_number, avoid, topic, seed)
+    
+    return ai_question
+
+def get_fallback_question_by_difficulty(
+    question_number: int,
+    avoid: Sequence[str] = (),
+    topic: Optional[str] = None,
+    seed: Optional[int] = None
+) -> Tuple[str, Optional[str]]:
+    """
+    Get a (question, reference answer) for the difficulty level from the question bank,
+    preferring the topic and avoiding near-duplicates of the questions in `avoid`.
+    
+    With a seed (one per interview) the draws follow one shuffle of the bank,
+    numbered by how many questions were asked before, so an interview never
+    repeats a question; without one the draw is random. The built-in list is
+    used if the bank can't be read.
+    """
+    if seed is None:
+        seed = random.getrandbits(32)
+    try:
+        bank = get_question_bank()
+        for attempt in range(FALLBACK_DRAW_ATTEMPTS):
+            # Retries use draw numbers past the end of any interview, so they never collide with later draws
+            draw = len(avoid) + attempt * len(DIFFICULTY_LEVELS)
+            for group_topic in (topic, None) if topic else (None,):
+                drawn = bank.draw(question_number, seed, draw, group_topic)
+                if drawn is not None and not near_duplicate(drawn[0], avoid):
+                    return drawn
+    except sqlite3.Error:
+        metrics.increment("question_bank_errors_total")
+    
+    questions = FALLBACK_QUESTIONS_BY_LEVEL[question_number]
+    return random.choice([entry for entry in questions if not near_duplicate(entry[0], avoid)] or questions)
+
+def choose_plan_topics() -> Dict[int, str]:
+    """
+    Pick one topic per difficulty level, avoiding topics that share a word with
+    one already picked (e.g. two kinds of pivot tables) whenever possible.
+    """
+    topics = {}
+    picked_words = set()
+    for level, info in DIFFICULTY_LEVELS.items():
+        distinct = [topic for topic in info["topics"] if not shingles(topic) & picked_words]
+        topics[level] = random.choice(distinct or info["topics"])
+        picked_words |= shingles(topics[level])
+    return topics
+
+def generate_interview_plan(topics: Dict[int, str], seed: Optional[int] = None) -> Dict[int, Tuple[str, Optional[str]]]:
+    """
+    Return a (question, reference answer) for every level in `topics` ({level: topic}) using one API request.
+    
+    All levels are asked for together in one structured request. A level whose
+    slot is missing, unreadable or a near-duplicate of another level's question
+    takes a pre-generated question from the pool, or a question bank question if
+    the pool has none, so the pool is only drawn on (and refilled) for failed slots.
+    """
+    if not topics:
+        return {}
+    
+    slots = "\n".join(
+        f"Level {level} ({DIFFICULTY_LEVELS[level]['level']}): {topic} - {DIFFICULTY_LEVELS[level]['description']}"
+        for level, topic in topics.items()
+    )
+    response = call_gemini_api(
+        INTERVIEW_PLAN_PROMPT.render(slots=slots),
+        max_length=INTERVIEW_PLAN_TOKENS_PER_QUESTION * len(topics),
+        priority=Priority.QUESTION,
+        call_site="interview_plan",
+        response_schema=INTERVIEW_PLAN_SCHEMA
+    )
+    planned = {}
+    if response is not None:
+        planned, repaired = parse_interview_plan(response, list(topics))
+        if repaired and planned:
+            record_repair("interview_plan")
+        if len(planned) < len(topics):
+            record_failure("interview_plan", "parse_failure")
+    
+    pool = get_question_pool()
+    questions = {}
+    for level, topic in topics.items():
+        question = planned.get(level)
+        chosen = [text for text, _ in questions.values()]
+        if question is not None and not near_duplicate(question[0], chosen):
+            pool.index.add(question[0])
+            questions[level] = question
+            continue
+        record_fallback("interview_plan", None if response is None else "parse_failure")
+        pooled = pool.get(level, topic, reject=partial(near_duplicate, others=chosen) if chosen else None)
+        questions[level] = pooled or get_fallback_question_by_difficulty(level, chosen, topic, seed)
+    return questions
+
+def keyword_fallback_score(answer: str, keyword_match: Optional[KeywordMatch] = None) -> Tuple[int, str]:
+    """
+    Score an answer offline by its weighted Excel keyword hits when the API is unavailable;
+    generic terms such as "formula" count for half as much as specific features.
+    """
+    if keyword_match is None:
+        keyword_match = match_keywords(answer)
+    keyword_weight = keyword_match.weighted_total
+    
+    if len(answer.strip()) < BRIEF_ANSWER_CHARS:
+        return 0, "Answer too brief - please provide more detail"
+    elif keyword_weight >= 3 and len(answer) > 100:
+        return 2, "Excellent technical knowledge demonstrated"
+    elif keyword_weight >= 2 and len(answer) > 50:
+        return 2, "Good technical knowledge with relevant Excel concepts"
+    elif keyword_weight > 0 and len(answer) > 30:
+        return 1, "Shows some Excel knowledge but could be more detailed"
+    elif keyword_match.mentions_basics:
+        return 1, "Basic understanding shown but needs more technical detail"
+    else:
+        return 0, "Limited Excel knowledge demonstrated"
+
+def keyword_fallback_scores(answers: List[str]) -> List[Tuple[int, str]]:
+    """
+    Score many answers with the keyword fallback, matching them all in one pass.
+    """
+    return [keyword_fallback_score(answer, match) for answer, match in zip(answers, match_keywords_batch(answers))]
+
+def resolve_reference_answers(
+    pairs: List[Tuple[str, str]],
+    references: Optional[Sequence[Optional[str]]] = None
+) -> List[Optional[str]]:
+    """
+    Return the reference answer for each (question, answer) pair, taken from
+    `references` where given and looked up by question otherwise.
+    """
+    return [
+        (references[i] if references is not None else None) or reference_answer_for(question)
+        for i, (question, _) in enumerate(pairs)
+    ]
+
+def local_fallback_scores(
+    pairs: List[Tuple[str, str]],
+    references: Optional[Sequence[Optional[str]]] = None
+) -> List[Tuple[int, str]]:
+    """
+    Score (question, answer) pairs without the API.
+    
+    Answers to questions with a reference answer (from `references`, else looked
+    up) are graded by their TF-IDF similarity to it, all in one batch; the rest,
+    and answers too brief to grade, fall back to keyword counting.
+    """
+    references = resolve_reference_answers(pairs, references)
+    graded = [
+        i for i, ((_, answer), reference) in enumerate(zip(pairs, references))
+        if reference and len(answer.strip()) >= BRIEF_ANSWER_CHARS
+    ]
+    results: Dict[int, Tuple[int, str]] = {}
+    if graded:
+        grades = get_similarity_grader().grade([pairs[i][1] for i in graded], [references[i] for i in graded])
+        for i, (score, explanation, _) in zip(graded, grades):
+            results[i] = (score, explanation)
+    rest = [i for i in range(len(pairs)) if i not in results]
+    results.update(zip(rest, keyword_fallback_scores([pairs[i][1] for i in rest])))
+    record_tier("fallback", len(pairs))
+    return [results[i] for i in range(len(pairs))]
+
+def cascade_scores(
+    pairs: List[Tuple[str, str]],
+    references: Optional[Sequence[Optional[str]]] = None
+) -> Dict[int, Tuple[int, str, str]]:
+    """
+    Score the (question, answer) pairs whose grade the local tiers are sure of,
+    returning {pair index: (score, explanation, tier)}; the rest need the model.
+    
+    The tiers run cheapest first: blank answers, brief answers, then similarity
+    to the reference answer, which settles only answers at or above
+    CASCADE_ACCEPT_SIMILARITY or below CASCADE_REJECT_SIMILARITY. An answer to a
+    question without a reference answer is never given a final score here
+    unless it is blank or brief.
+    """
+    if not CASCADE_EVALUATION or not pairs:
+        return {}
+    references = resolve_reference_answers(pairs, references)
+    results: Dict[int, Tuple[int, str, str]] = {}
+    
+    for i, (_, answer) in enumerate(pairs):
+        if not answer.strip():
+            results[i] = (0, "No answer given", "blank")
+        elif len(answer.strip()) < BRIEF_ANSWER_CHARS:
+            results[i] = (0, "Answer too brief - please provide more detail", "brief")
+    
+    graded = [i for i in range(len(pairs)) if i not in results and references[i]]
+    if graded:
+        similarities = get_similarity_grader().similarities(
+            [pairs[i][1] for i in graded], [references[i] for i in graded]
+        )
+        for i, similarity in zip(graded, similarities):
+            if similarity >= CASCADE_ACCEPT_SIMILARITY or similarity < CASCADE_REJECT_SIMILARITY:
+                results[i] = (*score_for_similarity(similarity), "similarity")
+    
+    for tier in ("blank", "brief", "similarity"):
+        record_tier(tier, sum(1 for result in results.values() if result[2] == tier))
+    return results
+
+def evaluate_answer(
+    question: str,
+    answer: str,
+    timeout: Optional[float] = None,
+    reference_answer: Optional[str] = None
+) -> Tuple[int, str, str]:
+    """
+    Evaluate the candidate's answer and return a score (0-2), explanation and the
+    tier that decided it. Clear-cut answers are scored locally (see cascade_scores);
+    results from the API are stored in the shared evaluation cache.
+    """
+    local = cascade_scores([(question, answer)], [reference_answer])
+    if local:
+        return local[0]
+    
+    cached = cached_evaluation(question, answer)
+    if cached is not None:
+        record_tier("cache")
+        return (*cached, "cache")
+    
+    prompt = EVALUATION_PROMPT.render(question=question, answer=EVALUATION_PROMPT.clip(answer))
+    
+    response = call_gemini_api(
+        prompt,
+        max_length=150,
+        timeout=timeout,
+        priority=Priority.EVALUATION,
+        call_site="evaluation",
+        response_schema=EVALUATION_SCHEMA if STRUCTURED_EVALUATION else None
+    )
+    if response is None:
+        record_fallback("evaluation")
+        return (*local_fallback_scores([(question, answer)], [reference_answer])[0], "fallback")
+    
+    result, repaired = parse_evaluation(response)
+    if result is None:
+        # Asking again would cost another call for the same drift; score it locally instead
+        record_failure("evaluation", "parse_failure")
+        record_fallback("evaluation", "parse_failure")
+        return (*local_fallback_scores([(question, answer)], [reference_answer])[0], "fallback")
+    if repaired:
+        record_repair("evaluation")
+    
+    record_tier("llm")
+    score, explanation = result
+    cache_evaluation(question, answer, score, explanation)
+    return score, explanation, "llm"
+
+def evaluate_answers_concurrently(
+    pairs: List[Tuple[str, str]],
+    references: Optional[Sequence[Optional[str]]] = None
+) -> List[Tuple[int, str, str]]:
+    """
+    Evaluate (question, answer) pairs with one API call each, all in flight at once.
+    
+    The wait is roughly one round-trip rather than one per question. Results
+    (score, explanation, tier) come back in input order; calls that time out or
+    fail are scored locally.
+    """
+    if not pairs:
+        return []
+    references = list(references) if references is not None else [None] * len(pairs)
+    
+    executor = ThreadPoolExecutor(max_workers=MAX_EVALUATION_WORKERS)
+    futures = [
+        executor.submit(evaluate_answer, question, answer, EVALUATION_TIMEOUT_SECONDS, reference)
+        for (question, answer), reference in zip(pairs, references)
+    ]
+    
+    results: List[Optional[Tuple[int, str, str]]] = []
+    timed_out = []
+    deadline = time.monotonic() + EVALUATION_TIMEOUT_SECONDS
+    for i, future in enumerate(futures):
+        try:
+            results.append(future.result(timeout=max(0, deadline - time.monotonic())))
+        except Exception:
+            record_fallback("evaluation", "timeout")
+            results.append(None)
+            timed_out.append(i)
+    fallback_scores = local_fallback_scores([pairs[i] for i in timed_out], [references[i] for i in timed_out])
+    for i, (score, explanation) in zip(timed_out, fallback_scores):
+        results[i] = (score, explanation, "fallback")
+    
+    # Don't wait on calls that overran the deadline; their results are no longer needed
+    executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+def build_batch_evaluation_prompt(pairs: List[Tuple[str, str]]) -> str:
+    """
+    Build a single prompt that asks for a JSON evaluation of every (question, answer) pair.
+    """
+    qa_block = ""
+    for i, (question, answer) in enumerate(pairs, 1):
+        qa_block += f"Question {i}: {question}\n"
+        qa_block += f"Answer {i}: {BATCH_EVALUATION_PROMPT.clip(answer)}\n\n"
+    
+    return BATCH_EVALUATION_PROMPT.render(qa_block=qa_block)
+
+def evaluate_answers_batch(pairs: List[Tuple[str, str]], timeout: Optional[float] = None) -> Optional[Dict[int, Tuple[int, str]]]:
+    """
+    Score all (question, answer) pairs with a single structured API request.
+    
+    Returns None if the API call itself failed, otherwise the parsed
+    {pair index: (score, explanation)} for every entry that could be read.
+    """
+    prompt = build_batch_evaluation_prompt(pairs)
+    response = call_gemini_api(
+        prompt,
+        max_length=BATCH_EVALUATION_TOKENS_PER_ANSWER * len(pairs),
+        timeout=timeout,
+        priority=Priority.EVALUATION,
+        call_site="batch_evaluation",
+        response_schema=BATCH_EVALUATION_SCHEMA if STRUCTURED_EVALUATION else None
+    )
+    
+    if response is None:
+        return None
+    
+    results, repaired = parse_batch_evaluation(response, len(pairs))
+    if repaired and results:
+        record_repair("batch_evaluation")
+    if len(results) < len(pairs):
+        record_failure("batch_evaluation", "parse_failure")
+        record_fallback("batch_evaluation", "parse_failure", count=len(pairs) - len(results))
+    return results
+
+def evaluate_all_answers(questions_answers: List[Dict], skipped_questions: Optional[List[int]] = None) -> List[Dict]:
+    """
+    Evaluate all answers at once when the user submits all answers.
+    Skipped questions (by index) score 0 without being evaluated. The tier that
+    decided each score is stored in its 'evaluation_tier'.
+    
+    Clear-cut answers are scored locally first (see cascade_scores). With
+    BATCH_EVALUATION every other pending answer is scored in one request; answers
+    the batch response doesn't cover are evaluated individually. If the API is
+    unavailable altogether, every answer is scored locally.
+    """
+    skipped_questions = skipped_questions or []
+    pending = []
+    for i, qa in enumerate(questions_answers):
+        if i in skipped_questions:
+            qa['score'] = 0
+            qa['explanation'] = 'Question was skipped'
+            qa['evaluation_tier'] = 'skipped'
+        elif qa['score'] == 0 and qa['explanation'] == '':
+            pending.append(i)
+    
+    references = {i: questions_answers[i].get('reference_answer') for i in pending}
+    local = cascade_scores(
+        [(questions_answers[i]['question'], questions_answers[i]['answer']) for i in pending],
+        [references[i] for i in pending]
+    )
+    results = {pending[j]: result for j, result in local.items()}
+    
+    # Answers seen before (in any session) are served from the evaluation cache
+    for i in pending:
+        if i in results:
+            continue
+        cached = cached_evaluation(questions_answers[i]['question'], questions_answers[i]['answer'])
+        if cached is not None:
+            record_tier("cache")
+            results[i] = (*cached, "cache")
+    
+    uncached = [i for i in pending if i not in results]
+    if BATCH_EVALUATION and len(uncached) > 1:
+        pairs = [(questions_answers[i]['question'], questions_answers[i]['answer']) for i in uncached]
+        batch_results = evaluate_answers_batch(pairs, timeout=BATCH_EVALUATION_TIMEOUT_SECONDS)
+        if batch_results is None:
+            # Per-question calls would hit the same outage, so don't retry them
+            record_fallback("batch_evaluation", count=len(uncached))
+            fallback_scores = local_fallback_scores(pairs, [references[i] for i in uncached])
+            for i, (score, explanation) in zip(uncached, fallback_scores):
+                results[i] = (score, explanation, "fallback")
+        else:
+            record_tier("llm", len(batch_results))
+            for j, (score, explanation) in batch_results.items():
+                question, answer = pairs[j]
+                cache_evaluation(question, answer, score, explanation)
+                results[uncached[j]] = (score, explanation, "llm")
+    
+    remaining = [i for i in pending if i not in results]
+    individual_results = evaluate_answers_concurrently(
+        [(questions_answers[i]['question'], questions_answers[i]['answer']) for i in remaining],
+        [references[i] for i in remaining]
+    )
+    results.update(zip(remaining, individual_results))
+    
+    for i in pending:
+        qa = questions_answers[i]
+        qa['score'], qa['explanation'], qa['evaluation_tier'] = results[i]
+    
+    return questions_answers
+
+def questions_answers_digest(questions_answers: List[Dict]) -> str:
+    """
+    Hash the scored Q&A list so each finished interview maps to a single report.
+    """
+    payload = json.dumps(
+        [[qa['question'], qa['answer'], qa['score'], qa['explanation']] for qa in questions_answers],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def max_score(questions_answers: List[Dict]) -> int:
+    """
+    Return the points available for the questions asked (2 per question).
+    """
+    return 2 * len(questions_answers)
+
+def skill_level_for(percentage: float) -> str:
+    """
+    Map a percentage of the available points to its skill level band.
+    """
+    return next(level for threshold, level in SKILL_BANDS if percentage >= threshold)
+
+def summarize_scores(questions_answers: List[Dict]) -> Tuple[int, float, str]:
+    """
+    Return the total score, percentage and skill level band for a scored interview.
+    The percentage is taken over the questions actually asked, which adaptive interviews may cut short.
+    """
+    total_score = sum(qa['score'] for qa in questions_answers)
+    
+    percentage = (total_score / max_score(questions_answers)) * 100 if questions_answers else 0.0
+    
+    return total_score, percentage, skill_level_for(percentage)
+
+def build_final_report_prompt(questions_answers: List[Dict]) -> str:
+    """
+    Build the Gemini prompt for the professional feedback report.
+    """
+    qa_summary = ""
+    
+    for i, qa in enumerate(questions_answers, 1):
+        qa_summary += f"Q{i}: {qa['question']}\n"
+        qa_summary += f"Your Answer: {REPORT_PROMPT.clip(qa['answer'])}\n"
+        if qa.get('reference_answer'):
+            qa_summary += f"Correct Answer: {qa['reference_answer']}\n"
+        qa_summary += f"Score: {qa['score']}/2\n\n"
+    
+    total_score, percentage, skill_level = summarize_scores(questions_answers)
+    
+    return REPORT_PROMPT.render(
+        qa_summary=qa_summary,
+        total_score=total_score,
+        max_score=max_score(questions_answers),
+        percentage=percentage,
+        skill_level=skill_level
+    )
+
+def build_fallback_report(questions_answers: List[Dict]) -> str:
+    """
+    Build the feedback report locally when the Gemini API is unavailable.
+    """
+    total_score, percentage, skill_level = summarize_scores(questions_answers)
+    
+    high_scores = [qa for qa in questions_answers if qa['score'] == 2]
+    low_scores = [qa for qa in questions_answers if qa['score'] == 0]
+    
+    strengths = []
+    if high_scores:
+        strengths.append(f"Strong performance on {len(high_scores)} questions with detailed technical knowledge")
+    if any('vlookup' in qa['answer'].lower() or 'index' in qa['answer'].lower() for qa in high_scores):
+        strengths.append("Good understanding of lookup functions and reference techniques")
+    if any('pivot' in qa['answer'].lower() for qa in high_scores):
+        strengths.append("Solid grasp of pivot tables and data analysis capabilities")
+    if any('formula' in qa['answer'].lower() for qa in high_scores):
+        strengths.append("Strong formula and function knowledge with practical application")
+    if any('chart' in qa['answer'].lower() or 'dashboard' in qa['answer'].lower() for qa in high_scores):
+        strengths.append("Effective data visualization and dashboard creation skills")
+    
+ 
+    improvements = []
+    if low_scores:
+        improvements.append(f"Focus on {len(low_scores)} areas where technical knowledge needs strengthening")
+    if any('vlookup' in qa['question'].lower() and qa['score'] < 2 for qa in questions_answers):
+        improvements.append("Practice with VLOOKUP, INDEX/MATCH and advanced lookup techniques")
+    if any('pivot' in qa['question'].lower() and qa['score'] < 2 for qa in questions_answers):
+        improvements.append("Review pivot table creation, calculated fields, and advanced data analysis techniques")
+    if any('formula' in qa['question'].lower() and qa['score'] < 2 for qa in questions_answers):
+        improvements.append("Strengthen formula writing, nested functions, and array formula usage")
+    if any('chart' in qa['question'].lower() and qa['score'] < 2 for qa in questions_answers):
+        improvements.append("Improve data visualization techniques and interactive dashboard creation")
+    
+    if percentage >= 80:
+        recommendation = f"Excellent performance at {skill_level} level! You demonstrate strong Excel skills suitable for advanced roles."
+        resources = "- Microsoft's official Power BI and Power Query documentation\n- Advanced Excel courses on LinkedIn Learning or Coursera\n- Excel MVP blogs and forums for cutting-edge techniques"
+    elif percentage >= 50:
+        recommendation = f"Good job at {skill_level} level! You have solid Excel knowledge with room for improvement in specific areas."
+        resources = "- ExcelJet.net for advanced function tutorials\n- Chandoo.org for practical Excel applications\n- YouTube channels like ExcelIsFun for detailed walkthroughs"
+    else:
+        recommendation = f"You're currently at {skill_level} level. Consider additional Excel training and practice to strengthen your technical skills."
+        resources = "- Microsoft's Excel Essentials training\n- GCF Learn Free Excel tutorials\n- YouTube channels like Leila Gharani for beginner-friendly guides"
+    
+    return f"""**Professional Feedback Report**
+
+**Overall Performance Summary:**
+You completed the Excel mock interview with a total score of {total_score}/{max_score(questions_answers)} ({percentage:.1f}%), which places you at a {skill_level} level.
+
+**Strengths:**
+{chr(10).join(f"- {strength}" for strength in strengths) if strengths else "- Showed effort in completing all questions"}
+
+**Areas for Improvement:**
+{chr(10).join(f"- {improvement}" for improvement in improvements) if improvements else "- Focus on Excel functions and advanced features"}
+
+**Final Score and Recommendation:**
+Total Score: {total_score}/{max_score(questions_answers)}
+Recommendation: {recommendation}
+
+**Suggested Resources:**
+{resources}
+
+**Next Steps:**
+- Practice with Excel functions and formulas regularly with real-world datasets
+- Work on pivot tables and data analysis techniques through guided projects
+- Review conditional formatting and data validation for data integrity
+- Consider taking advanced Excel courses for professional development
+- Apply your skills to solve actual business problems to reinforce learning
+
+Remember that Excel proficiency comes with consistent practice. Keep challenging yourself with new problems and techniques!"""
+
+def generate_final_report(questions_answers: List[Dict]) -> str:
+    """
+    Generate a professional feedback report using Google Gemini.
+    """
+    response = call_gemini_api(
+        build_final_report_prompt(questions_answers), max_length=500, priority=Priority.REPORT, call_site="report"
+    )
+    
+    if response is None or "Error" in response:
+        record_fallback("report", None if response is None else "parse_failure")
+        return build_fallback_report(questions_answers)
+    
+    return response
+
+def stream_final_report(questions_answers: List[Dict]) -> Iterator[str]:
+    """
+    Stream the feedback report from Google Gemini, yielding text as it arrives.
+    Yields the locally built report instead if the API returns nothing, and raises
+    StreamInterrupted if the stream fails partway through.
+    """
+    received = False
+    for chunk in stream_gemini_api(build_final_report_prompt(questions_answers), max_length=500):
+        received = True
+        yield chunk
+    
+    if not received:
+        record_fallback("report_stream")
+        yield build_fallback_report(questions_answers)
+
+def format_report(report: str, streaming: bool = False) -> str:
+    """
+    Turn the report's **bold** section titles into markdown headings.
+    
+    With streaming=True the text may be cut off mid-stream, so a trailing
+    half-received "**" marker is dropped rather than rendered.
+    """
+    if streaming:
+        report = report.rstrip('*')
+    
+    sections = report.split('**')
+    formatted_report = ""
+    
+    for i, section in enumerate(sections):
+        if i == 0:  # Skip the first empty section
+            continue
+            
+        if i % 2 == 1:  # Section titles
+            section_title = section.strip(':*')
+            formatted_report += f"### {section_title}\n\n"
+        else:  # Section content
+            content = section.strip()
+            formatted_report += f"{content}\n\n"
+    
+    return formatted_report
@@ -0,0 +1,131 @@
+import bisect
+import re
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Pattern
+
+
+# keyword -> (topic, weight). Generic terms weigh less than specific Excel features.
+EXCEL_KEYWORDS = {
+    'vlookup': ('lookup', 1.0),
+    'hlookup': ('lookup', 1.0),
+    'index': ('lookup', 1.0),
+    'match': ('lookup', 1.0),
+    'pivot': ('pivot tables', 1.0),
+    'pivot table': ('pivot tables', 1.0),
+    'formula': ('formulas', 0.5),
+    'function': ('formulas', 0.5),
+    'array formula': ('formulas', 1.0),
+    'conditional formatting': ('formatting', 1.0),
+    'data validation': ('data quality', 1.0),
+    'sumif': ('conditional aggregation', 1.0),
+    'countif': ('conditional aggregation', 1.0),
+    'averageif': ('conditional aggregation', 1.0),
+    'sumifs': ('conditional aggregation', 1.0),
+    'countifs': ('conditional aggregation', 1.0),
+    'if statement': ('logic', 1.0),
+    'nested if': ('logic', 1.0),
+    'concatenate': ('text', 1.0),
+    'text functions': ('text', 1.0),
+    'pmt': ('financial', 1.0),
+    'fv': ('financial', 1.0),
+    'pv': ('financial', 1.0),
+    'financial functions': ('financial', 1.0),
+    'date functions': ('dates', 1.0),
+    'chart': ('visualization', 1.0),
+    'dashboard': ('visualization', 1.0),
+    'slicer': ('visualization', 1.0),
+    'filter': ('data analysis', 0.5),
+    'sort': ('data analysis', 0.5),
+    'macro': ('automation', 1.0)
+}
+
+BASIC_TERMS = ['excel', 'spreadsheet', 'data', 'table']
+
+# Other forms matched as the keyword they stand for. Inflections are listed one by one
+# rather than accepted for every keyword, so "indexing" or "matching" don't count.
+KEYWORD_ALIASES = {
+    'formulae': 'formula',
+    'sorting': 'sort',
+    'sorted': 'sort',
+    'filtering': 'filter',
+    'filtered': 'filter'
+}
+
+# Separator placed between answers in batch mode; it can't occur inside a word, so no match spans two answers
+_BATCH_SEPARATOR = "\n\0\n"
+
+
+def compile_terms(terms: Iterable[str]) -> Pattern:
+    """
+    Compile terms into one case-insensitive alternation with word boundaries.
+
+    Longer terms are tried first so "pivot table" is matched as a whole instead of
+    also counting "pivot". The words of a multi-word term may be separated by
+    spaces or hyphens ("conditional-formatting"), and plurals ending in "s" or
+    "es" are accepted, but not other suffixes, so "pv" does not match inside
+    "pvt" nor "index" inside "indexing".
+    """
+    ordered = sorted(set(terms), key=lambda term: (-len(term), term))
+    alternation = "|".join(r"[\s-]+".join(re.escape(word) for word in term.split()) for term in ordered)
+    return re.compile(rf"\b({alternation})(?:e?s)?\b", re.IGNORECASE)
+
+
+KEYWORD_PATTERN = compile_terms(list(EXCEL_KEYWORDS) + list(KEYWORD_ALIASES))
+BASIC_TERMS_PATTERN = compile_terms(BASIC_TERMS)
+
+
+class KeywordMatch(NamedTuple):
+    """Keywords found in one answer, with their weighted hits per topic."""
+    keywords: FrozenSet[str]
+    topic_hits: Dict[str, float]
+    mentions_basics: bool
+
+    @property
+    def weighted_total(self) -> float:
+        return sum(self.topic_hits.values())
+
+
+def _canonical(term: str) -> str:
+    term = " ".join(re.split(r"[\s-]+", term.lower()))
+    return KEYWORD_ALIASES.get(term, term)
+
+
+def _build_match(keywords: FrozenSet[str], mentions_basics: bool) -> KeywordMatch:
+    topic_hits: Dict[str, float] = {}
+    for keyword in keywords:
+        topic, weight = EXCEL_KEYWORDS[keyword]
+        topic_hits[topic] = topic_hits.get(topic, 0.0) + weight
+    return KeywordMatch(keywords, topic_hits, mentions_basics)
+
+
+def match_keywords(answer: str) -> KeywordMatch:
+    """Find the distinct Excel keywords in an answer in a single regex pass."""
+    keywords = frozenset(_canonical(m.group(1)) for m in KEYWORD_PATTERN.finditer(answer))
+    return _build_match(keywords, BASIC_TERMS_PATTERN.search(answer) is not None)
+
+
+def match_keywords_batch(answers: List[str]) -> List[KeywordMatch]:
+    """
+    Match keywords across many answers at once.
+
+    The answers are joined into one string and scanned with a single pass of each
+    pattern; match offsets are mapped back to their answer by binary search.
+    """
+    if not answers:
+        return []
+
+    starts = []
+    offset = 0
+    for answer in answers:
+        starts.append(offset)
+        offset += len(answer) + len(_BATCH_SEPARATOR)
+    text = _BATCH_SEPARATOR.join(answers)
+
+    keywords: List[set] = [set() for _ in answers]
+    for m in KEYWORD_PATTERN.finditer(text):
+        keywords[bisect.bisect_right(starts, m.start()) - 1].add(_canonical(m.group(1)))
+
+    mentions_basics = [False] * len(answers)
+    for m in BASIC_TERMS_PATTERN.finditer(text):
+        mentions_basics[bisect.bisect_right(starts, m.start()) - 1] = True
+
+    return [_build_match(frozenset(found), basics) for found, basics in zip(keywords, mentions_basics)]
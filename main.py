@@ -1,10 +1,27 @@
-import streamlit as st
-import requests
-import json
 import random
-from typing import Dict, List, Tuple
-import google.generativeai as genai
-import json
+import streamlit as st
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from adaptive import ADAPTIVE_MAX_QUESTIONS, choose_next_question
+from catalog import APP_STYLE, DIFFICULTY_LEVELS, SCORE_CLASSES, SCORE_LABELS, SKILL_BAND_ICONS, UNKNOWN_LEVEL
+from interviewer import (
+    EVALUATION_TIMEOUT_SECONDS,
+    StreamInterrupted,
+    choose_plan_topics,
+    evaluate_all_answers,
+    evaluate_answer,
+    format_report,
+    generate_excel_question,
+    generate_final_report,
+    generate_interview_plan,
+    max_score,
+    questions_answers_digest,
+    stream_final_report,
+    summarize_scores
+)
+from metrics import increment, start_metrics_server
+from prompts import MAX_ANSWER_CHARS
+from session_store import encode_state, get_session_store, is_valid_token, new_session_token
 
 
 st.set_page_config(
@@ -15,399 +32,311 @@ st.set_page_config(
 )
 
 
+# The next level's question is generated in the background while the current one is answered
+PREFETCH_WORKERS = 8
 
-GEMINI_API_KEY = "YOUR_API_KEY"
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-1.5-flash')
+# Render the final report incrementally as Gemini streams it back
+STREAM_FINAL_REPORT = True
 
+# Answers are scored in the background as they are saved, so few are left to evaluate on submit
+EVALUATION_WORKERS = 4
 
+# Slow work (next-question planning, final evaluation, the report) runs as background jobs;
+# the page polls them instead of blocking the script thread
+JOB_WORKERS = 8
+JOB_POLL_SECONDS = 0.5
 
-
-FALLBACK_QUESTIONS = [
-    "How would you use VLOOKUP to find the price of a product based on its ID, and what are the key parameters you need to consider?",
-    "Explain the difference between VLOOKUP and INDEX/MATCH functions. When would you use each one?",
-    "How would you create a pivot table to analyze sales data by region and product category?",
-    "Describe the process of cleaning data with duplicate entries and inconsistent formatting in Excel.",
-    "How would you use conditional formatting to highlight cells that meet multiple criteria simultaneously?",
-    "Explain how to create an array formula that calculates the sum of values based on multiple conditions.",
-    "How would you use the IF function with nested logic to categorize data into different performance levels?",
-    "Describe how to create a dynamic dashboard using pivot tables, slicers, and charts.",
-    "How would you use the INDEX and MATCH functions together to perform a two-way lookup?",
-    "Explain the process of creating data validation rules to ensure data integrity in Excel.",
-    "How would you use the PMT function to calculate monthly loan payments and what parameters are required?",
-    "Describe how to use the CONCATENATE function and text functions to clean and format data.",
-    "How would you create a chart that automatically updates when new data is added to your worksheet?",
-    "Explain how to use the SUMIFS function to sum values based on multiple criteria.",
-    "How would you create a macro to automate repetitive tasks in Excel?"
+# Interview state saved to the session store, so a restart or a move to another replica can resume it.
+# Background futures can't be saved; work they had in flight is simply redone.
+PERSISTED_SESSION_KEYS = [
+    'interview_started', 'current_question', 'questions_answers', 'interview_complete', 'answers_evaluated',
+    'show_submit_all', 'marked_for_review', 'skipped_questions', 'final_report', 'final_report_key',
+    'adaptive_mode', 'next_question_plan', 'question_seed', 'plan_topics'
 ]
 
+@st.cache_resource
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """
+    Create the process-wide thread pool used to generate upcoming questions in the background.
+    """
+    return ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="question-prefetch")
 
-EXCEL_TOPICS = [
-    "VLOOKUP and HLOOKUP functions",
-    "INDEX and MATCH functions",
-    "IF statements and nested IFs",
-    "Pivot tables and data analysis",
-    "Data cleaning and validation",
-    "Conditional formatting",
-    "Array formulas",
-    "Data visualization with charts",
-    "Advanced filtering and sorting",
-    "Macros and automation",
-    "Financial functions (PMT, NPV, IRR)",
-    "Statistical functions (AVERAGEIF, COUNTIF, SUMIF)",
-    "Text functions (CONCATENATE, LEFT, RIGHT, MID)",
-    "Date and time functions",
-    "Lookup and reference functions"
-]
-
-def call_gemini_api(prompt: str, max_length: int = 500) -> str:
+def prefetch_question(question_number: int, topic: Optional[str] = None):
     """
-    Call Google Gemini API for question generation and evaluation.
+    Start generating the question for the given level while the candidate works on the current one.
+    It is kept distinct from the questions asked so far.
     """
-    try:
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                max_output_tokens=max_length,
-                temperature=0.7,
-            )
-        )
-        return response.text.strip()
+    if question_number > len(DIFFICULTY_LEVELS) or question_number in st.session_state.prefetched_questions:
+        return
+    asked = tuple(qa['question'] for qa in st.session_state.questions_answers)
+    st.session_state.prefetched_questions[question_number] = get_prefetch_executor().submit(
+        generate_excel_question, question_number, topic, asked, st.session_state.question_seed
+    )
+
+def planned_question(plan: Future, level: int) -> Future:
+    """
+    Return a future for one level's question that resolves when the interview plan does.
+    """
+    future = Future()
     
-    except Exception as e:
-        
+    def resolve(done: Future):
+        try:
+            future.set_result(done.result()[level])
+        except Exception as e:
+            future.set_exception(e)
+    
+    plan.add_done_callback(resolve)
+    return future
+
+def plan_topic(level: int) -> Optional[str]:
+    """Return the topic the interview plan chose for a level, or None if there is no plan."""
+    topics = st.session_state.plan_topics
+    return topics[level - 1] if 0 < level <= len(topics) else None
+
+def prefetch_interview_plan():
+    """
+    Generate the questions for every level with one request when the interview starts,
+    so each later question is ready as soon as it is needed.
+    """
+    topics = choose_plan_topics()
+    st.session_state.plan_topics = [topics[level] for level in sorted(topics)]
+    plan = get_prefetch_executor().submit(generate_interview_plan, topics, st.session_state.question_seed)
+    for level in topics:
+        st.session_state.prefetched_questions[level] = planned_question(plan, level)
+
+@st.cache_resource
+def get_job_executor() -> ThreadPoolExecutor:
+    """
+    Create the process-wide thread pool that runs background jobs for all sessions.
+    """
+    return ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+
+def start_job(name: str, fn, *args, replace: bool = False) -> Future:
+    """
+    Run fn(*args) in the background under a name, unless a job by that name is already
+    pending. With replace=True a pending job is superseded and its result ignored.
+    Job functions must only use their arguments, never st.session_state.
+    """
+    if replace or name not in st.session_state.jobs:
+        st.session_state.jobs[name] = get_job_executor().submit(fn, *args)
+    return st.session_state.jobs[name]
+
+def finished_job(name: str) -> Optional[Future]:
+    """Remove and return the named job once it has finished, or None if it is still running or was never started."""
+    future = st.session_state.jobs.get(name)
+    if future is None or not future.done():
         return None
+    return st.session_state.jobs.pop(name)
 
-def generate_excel_question(question_number: int) -> str:
-    """
-    Generate an Excel interview question with progressive difficulty using Google Gemini.
-    """
- 
-    difficulty_levels = {
-        1: {
-            "level": "Basic",
-            "topics": ["Basic formulas", "Simple functions", "Data entry", "Basic formatting"],
-            "description": "Beginner Excel skills - basic formulas, simple functions, data entry"
-        },
-        2: {
-            "level": "Intermediate-Basic", 
-            "topics": ["VLOOKUP", "IF statements", "Basic pivot tables", "Data sorting"],
-            "description": "Intermediate Excel skills - lookup functions, conditional logic, basic analysis"
-        },
-        3: {
-            "level": "Intermediate",
-            "topics": ["INDEX/MATCH", "Pivot tables", "Data cleaning", "Charts"],
-            "description": "Intermediate Excel skills - advanced lookups, data analysis, visualization"
-        },
-        4: {
-            "level": "Advanced-Intermediate",
-            "topics": ["Array formulas", "Conditional formatting", "Data validation", "Advanced pivot tables"],
-            "description": "Advanced Excel skills - complex formulas, data validation, advanced analysis"
-        },
-        5: {
-            "level": "Advanced",
-            "topics": ["Macros", "Financial functions", "Dashboard creation", "Advanced automation"],
-            "description": "Expert Excel skills - automation, complex analysis, professional dashboards"
-        }
-    }
-    
-    current_level = difficulty_levels[question_number]
-    topic = random.choice(current_level["topics"])
-    
-    prompt = f"""Generate a specific, practical Excel interview question for a {current_level['level']} level candidate.
-    
-    Difficulty Level: {current_level['level']}
-    Focus Topic: {topic}
-    Description: {current_level['description']}
-    
-    The question should:
-    - Match the {current_level['level']} difficulty level
-    - Be realistic and job-relevant
-    - Test appropriate Excel skills for this level
-    - Require a detailed answer
-    - Be clear and specific
-    - Progress naturally from basic to advanced concepts
-    
-    Format: Just provide the question, no additional text.
-    
-    Examples by level:
-    - Basic: "How would you calculate the sum of values in column A using a formula?"
-    - Intermediate: "How would you use VLOOKUP to find a product price based on its ID?"
-    - Advanced: "How would you create a dynamic dashboard with pivot tables and slicers?"
-    
-    Generate a {current_level['level']} level question about {topic}:"""
-    
-    
-    ai_question = call_gemini_api(prompt, max_length=200)
-    
-  
-    if ai_question is None or "Error" in ai_question:
-    
-        return get_fallback_question_by_difficulty(question_number)
-    
-    return ai_question
-
-def get_fallback_question_by_difficulty(question_number: int) -> str:
-    """
-    Get fallback questions organized by difficulty level.
-    """
-    fallback_questions_by_level = {
-        1: [
-            "How would you calculate the total sales for a month using a SUM formula?",
-            "Explain how to use the AVERAGE function to find the average of a range of numbers.",
-            "How would you format cells to display currency values with dollar signs?",
-            "What is the difference between relative and absolute cell references in Excel?"
-        ],
-        2: [
-            "How would you use VLOOKUP to find the price of a product based on its ID?",
-            "Explain how to use the IF function to categorize data into different performance levels.",
-            "How would you create a basic pivot table to summarize sales data by region?",
-            "How would you sort data by multiple columns in Excel?"
-        ],
-        3: [
-            "How would you use INDEX and MATCH functions together to perform a two-way lookup?",
-            "Explain how to clean data with duplicate entries and inconsistent formatting.",
-            "How would you create a chart that automatically updates when new data is added?",
-            "How would you use conditional formatting to highlight cells based on specific criteria?"
-        ],
-        4: [
-            "How would you create an array formula to calculate the sum of values based on multiple conditions?",
-            "Explain how to set up data validation rules to ensure data integrity in Excel.",
-            "How would you create a dynamic dashboard using pivot tables, slicers, and charts?",
-            "How would you use advanced conditional formatting with custom formulas?"
-        ],
-        5: [
-            "How would you create a macro to automate repetitive data entry tasks?",
-            "Explain how to use financial functions like PMT, FV, and NPV for loan calculations.",
-            "How would you build a comprehensive dashboard with multiple data sources and interactive elements?",
-            "How would you implement advanced data analysis using Power Query and Power Pivot?"
-        ]
-    }
-    
-    return random.choice(fallback_questions_by_level[question_number])
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def wait_for_job(future: Future, message: str):
+    """
+    Show a progress message until the job finishes, then rerun the app to pick up its result.
+    Only this fragment reruns while waiting, so the script thread is never blocked.
+    """
+    if future.done():
+        st.rerun()
+    st.info(message, icon="⏳")
 
-def evaluate_answer(question: str, answer: str) -> Tuple[int, str]:
+@st.cache_resource
+def get_evaluation_executor() -> ThreadPoolExecutor:
     """
-    Evaluate the candidate's answer and return a score (0-2) and explanation.
+    Create the process-wide thread pool used to score answers while the interview is in progress.
     """
-    prompt = f"""Evaluate this Excel interview answer and provide a score and brief explanation.
+    return ThreadPoolExecutor(max_workers=EVALUATION_WORKERS, thread_name_prefix="answer-evaluation")
 
-    Question: {question}
-    Answer: {answer}
-    
-    Scoring criteria:
-    - 0: Incorrect or completely wrong approach
-    - 1: Partially correct but missing key elements or has errors
-    - 2: Correct and comprehensive answer
-    
-    Respond in this exact format:
-    Score: [0, 1, or 2]
-    Explanation: [One-line explanation of the score]
-    
-    Be fair but thorough in your evaluation. Focus on technical accuracy and completeness."""
-    
-    response = call_gemini_api(prompt, max_length=150)
-    
- 
-    if response is None or "Error" in response:
-  
-        answer_lower = answer.lower()
-        excel_keywords = [
-            'vlookup', 'hlookup', 'index', 'match', 'pivot', 'pivot table', 
-            'formula', 'function', 'conditional formatting', 'data validation',
-            'array formula', 'sumif', 'countif', 'averageif', 'sumifs', 'countifs',
-            'if statement', 'nested if', 'concatenate', 'text functions',
-            'pmt', 'fv', 'pv', 'financial functions', 'date functions',
-            'chart', 'dashboard', 'slicer', 'filter', 'sort', 'macro'
-        ]
-        
-        keyword_count = sum(1 for keyword in excel_keywords if keyword in answer_lower)
-        
-        if len(answer) < 20:
-            return 0, "Answer too brief - please provide more detail"
-        elif keyword_count >= 3 and len(answer) > 100:
-            return 2, "Excellent technical knowledge demonstrated"
-        elif keyword_count >= 2 and len(answer) > 50:
-            return 2, "Good technical knowledge with relevant Excel concepts"
-        elif keyword_count >= 1 and len(answer) > 30:
-            return 1, "Shows some Excel knowledge but could be more detailed"
-        elif any(word in answer_lower for word in ['excel', 'spreadsheet', 'data', 'table']):
-            return 1, "Basic understanding shown but needs more technical detail"
-        else:
-            return 0, "Limited Excel knowledge demonstrated"
-    
+def score_answer_in_background(index: int):
+    """
+    Start scoring the saved answer to a question, unless that exact answer is already being scored.
+    A score for an earlier version of the answer is discarded.
+    """
+    qa = st.session_state.questions_answers[index]
+    submitted = st.session_state.answer_evaluations.get(index)
+    if submitted is not None:
+        if submitted[0] == qa['answer']:
+            return
+        submitted[1].cancel()
+    st.session_state.answer_evaluations[index] = (
+        qa['answer'],
+        get_evaluation_executor().submit(
+            evaluate_answer, qa['question'], qa['answer'], EVALUATION_TIMEOUT_SECONDS, qa.get('reference_answer')
+        )
+    )
 
+def score_sources(start_missing: bool) -> List[Optional[Future]]:
+    """
+    Return the background evaluation of each question's current answer, or None where there is none.
+    Skipped and unanswered questions never have one; with start_missing, other answers not yet
+    submitted for scoring are submitted now.
+    """
+    sources = []
+    for i, qa in enumerate(st.session_state.questions_answers):
+        submitted = st.session_state.answer_evaluations.get(i)
+        if i in st.session_state.skipped_questions or not qa['answer'].strip():
+            sources.append(None)
+            continue
+        if start_missing:
+            score_answer_in_background(i)
+            submitted = st.session_state.answer_evaluations[i]
+        sources.append(submitted[1] if submitted is not None and submitted[0] == qa['answer'] else None)
+    return sources
+
+def background_score(source: Optional[Future]) -> Optional[Tuple[int, str, str]]:
+    """Wait for a background evaluation and return its result, or None if there is none or it failed."""
+    if source is None:
+        return None
     try:
-        lines = response.split('\n')
-        score = 0
-        explanation = "No explanation provided"
-        
-        for line in lines:
-            if line.startswith("Score:"):
-                score_text = line.replace("Score:", "").strip()
-                if "0" in score_text:
-                    score = 0
-                elif "1" in score_text:
-                    score = 1
-                elif "2" in score_text:
-                    score = 2
-            elif line.startswith("Explanation:"):
-                explanation = line.replace("Explanation:", "").strip()
-        
-        return score, explanation
-    
+        return source.result()
     except Exception:
-        return 1, "Evaluation error - partial credit given"
-
-def evaluate_all_answers(questions_answers: List[Dict]) -> List[Dict]:
-    """
-    Evaluate all answers at once when the user submits all answers.
-    """
-    with st.spinner("Evaluating all your answers... This may take a moment."):
-        for i, qa in enumerate(questions_answers):
-      
-            if i in st.session_state.skipped_questions:
-                qa['score'] = 0
-                qa['explanation'] = 'Question was skipped'
-            elif qa['score'] == 0 and qa['explanation'] == '':
-      
-                score, explanation = evaluate_answer(qa['question'], qa['answer'])
-                qa['score'] = score
-                qa['explanation'] = explanation
-    
-    return questions_answers
+        return None
 
-def generate_final_report(questions_answers: List[Dict]) -> str:
+def plan_from_scores(questions_answers: List[Dict], sources: List[Optional[Future]]) -> Optional[Tuple[int, str]]:
     """
-    Generate a professional feedback report using Google Gemini.
+    Job: wait for the answers to be scored, then choose the next adaptive question.
+    Questions without a score count as 0.
     """
+    scores = [(background_score(source) or (0, '', ''))[0] for source in sources]
+    return choose_next_question(questions_answers, scores)
+
+def evaluate_with_background_scores(
+    questions_answers: List[Dict],
+    skipped_questions: List[int],
+    sources: List[Optional[Future]]
+) -> List[Dict]:
+    """
+    Job: take the background scores of answers unchanged since they were submitted, waiting for
+    any still running, and let evaluate_all_answers score the rest.
+    """
+    for qa, source in zip(questions_answers, sources):
+        result = background_score(source)
+        if result is not None:
+            qa['score'], qa['explanation'], qa['evaluation_tier'] = result
+    return evaluate_all_answers(questions_answers, skipped_questions)
 
-    qa_summary = ""
-    total_score = 0
-    
-
-    correct_answers = {
-        0: "To calculate the total cost, you would use the SUMPRODUCT function. In cell C7, the formula would be =SUMPRODUCT(A2:A6,B2:B6) which multiplies each item's price by its quantity and then adds all the results together.",
-        1: "To create a dynamic chart that updates automatically, you would: 1) Create a named range for your data (Ctrl+T or Insert > Table), 2) Insert a chart based on this table (Insert > Charts > desired chart type), 3) The chart will automatically update when data in the table changes. You can also use OFFSET or INDEX functions with COUNTA to create dynamic ranges.",
-        2: "To find the last value in column A, you can use: =LOOKUP(2,1/(A:A<>""),A:A) or =INDEX(A:A,MATCH(9.99999999999999E+307,A:A)) or =INDEX(A:A,COUNTA(A:A)). These formulas work even when the data has blank cells or is unsorted.",
-        3: "To create a conditional formatting rule that highlights cells with values above average: 1) Select the range, 2) Go to Home > Conditional Formatting > New Rule, 3) Choose 'Use a formula', 4) Enter =A1>AVERAGE($A$1:$A$100) (adjust range as needed), 5) Click Format and choose highlighting style, 6) Click OK. This will highlight all cells with values above the average of the selected range.",
-        4: "To create a pivot table summarizing sales by region and product: 1) Select your data range, 2) Go to Insert > PivotTable, 3) In the PivotTable Fields pane, drag 'Region' to Rows area, 'Product' to Columns area, and 'Sales' to Values area, 4) The pivot table will automatically calculate the sum of sales for each region-product combination. You can then add filters, change calculation type (e.g., to average), or add additional fields as needed."
-    }
-    
-    for i, qa in enumerate(questions_answers, 1):
-        qa_summary += f"Q{i}: {qa['question']}\n"
-        qa_summary += f"Your Answer: {qa['answer']}\n"
-        qa_summary += f"Correct Answer: {correct_answers[i-1]}\n"
-        qa_summary += f"Score: {qa['score']}/2\n\n"
-        total_score += qa['score']
-    
-
-    percentage = (total_score / 10) * 100
-    
+def stream_report_into(questions_answers: List[Dict], chunks: List[str]) -> str:
+    """
+    Job: stream the final report, appending chunks as they arrive so the page can show progress.
+    If the stream breaks off, the partial text is discarded and the report is generated in one request instead.
+    """
+    try:
+        for chunk in stream_final_report(questions_answers):
+            chunks.append(chunk)
+    except StreamInterrupted:
+        chunks.clear()
+        return generate_final_report(questions_answers)
+    return "".join(chunks)
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def show_report_progress(future: Future, chunks: List[str]):
+    """Render the report received so far, re-applying the section formatting, until the job finishes."""
+    if future.done():
+        st.rerun()
+    if chunks:
+        st.markdown(format_report("".join(chunks), streaming=True))
+    else:
+        st.info("Generating comprehensive evaluation report...", icon="⏳")
 
-    if percentage >= 90:
-        skill_level = "Expert"
-    elif percentage >= 75:
-        skill_level = "Advanced"
-    elif percentage >= 60:
-        skill_level = "Intermediate"
-    elif percentage >= 40:
-        skill_level = "Basic"
+def apply_question_plan():
+    """
+    Act on a finished adaptive planning job: move to the planned question, or offer
+    to submit all answers if the skill level is already settled.
+    A plan made for the first question or a restored session, which is already past
+    its last answered question, only records the plan.
+    """
+    future = finished_job("plan")
+    if future is None:
+        return
+    plan = future.result()
+    answered = st.session_state.current_question < len(st.session_state.questions_answers)
+    if plan is None:
+        st.session_state.show_submit_all = True
+        if not answered:
+            st.session_state.current_question = len(st.session_state.questions_answers) - 1
     else:
-        skill_level = "Beginner"
-    
-    prompt = f"""Generate a professional interview feedback report for an Excel mock interview.
+        st.session_state.next_question_plan = plan
+        if answered:
+            st.session_state.current_question += 1
+        st.session_state.current_answer = ""
+        st.session_state.show_submit_all = False
 
-    Interview Summary:
-    {qa_summary}
-    
-    Total Score: {total_score}/10 ({percentage:.1f}%), which puts the candidate at a {skill_level} level.
-    
-    Create a professional feedback report with these sections:
-    1. Overall Performance Summary - include specific strengths demonstrated
-    2. Strengths (areas where candidate performed well) - be specific about which Excel skills they demonstrated proficiency in
-    3. Areas for Improvement (weaknesses) - provide detailed analysis based on questions they struggled with
-    4. Specific Recommendations - include actionable steps and suggested resources tailored to their skill gaps
-    5. Final Score and Recommendation - with a motivational conclusion that encourages continued learning
-    
-    Be constructive, specific, and professional. Focus on Excel skills and provide actionable feedback that will help them improve their Excel skills for real-world applications.
-    
-    Important formatting guidelines:
-    - Do not include any placeholder text like [Candidate Name] or [Interviewer Name]
-    - Do not use asterisks (*) for formatting - use proper markdown formatting instead
-    - Focus only on genuine evaluation terms and feedback
-    - Make sure all sections are properly formatted with clear headings"""
+def upcoming_level() -> Optional[int]:
+    """
+    Return the difficulty level of the question being shown or about to be generated,
+    or None while an adaptive interview is still choosing it.
+    """
+    if st.session_state.current_question < len(st.session_state.questions_answers):
+        return st.session_state.questions_answers[st.session_state.current_question]['difficulty_level']
+    if st.session_state.adaptive_mode:
+        plan = st.session_state.next_question_plan
+        return plan[0] if plan else None
+    return st.session_state.current_question + 1
+
+def start_question_plan() -> Future:
+    """Start an adaptive planning job for the next question unless one is already running."""
+    questions_answers = [dict(qa) for qa in st.session_state.questions_answers]
+    return start_job("plan", plan_from_scores, questions_answers, score_sources(start_missing=True))
+
+def advance_question():
+    """
+    Move on to the next question, or offer to submit all answers once there are none left.
     
-    response = call_gemini_api(prompt, max_length=500)
+    Adaptive interviews first need the answer scored to choose the next question, so they
+    start a planning job instead; apply_question_plan moves on once it finishes, possibly
+    ending the interview early once the candidate's skill level is settled.
+    """
+    if st.session_state.adaptive_mode:
+        questions_answers = [dict(qa) for qa in st.session_state.questions_answers]
+        start_job("plan", plan_from_scores, questions_answers, score_sources(start_missing=True), replace=True)
+        return
     
-    if response is None or "Error" in response:
-
-        high_scores = [qa for qa in questions_answers if qa['score'] == 2]
-        low_scores = [qa for qa in questions_answers if qa['score'] == 0]
-        
-        strengths = []
-        if high_scores:
-            strengths.append(f"Strong performance on {len(high_scores)} questions with detailed technical knowledge")
-        if any('vlookup' in qa['answer'].lower() or 'index' in qa['answer'].lower() for qa in high_scores):
-            strengths.append("Good understanding of lookup functions and reference techniques")
-        if any('pivot' in qa['answer'].lower() for qa in high_scores):
-            strengths.append("Solid grasp of pivot tables and data analysis capabilities")
-        if any('formula' in qa['answer'].lower() for qa in high_scores):
-            strengths.append("Strong formula and function knowledge with practical application")
-        if any('chart' in qa['answer'].lower() or 'dashboard' in qa['answer'].lower() for qa in high_scores):
-            strengths.append("Effective data visualization and dashboard creation skills")
-        
- 
-        improvements = []
-        if low_scores:
-            improvements.append(f"Focus on {len(low_scores)} areas where technical knowledge needs strengthening")
-        if any('vlookup' in qa['question'].lower() and qa['score'] < 2 for qa in questions_answers):
-            improvements.append("Practice with VLOOKUP, INDEX/MATCH and advanced lookup techniques")
-        if any('pivot' in qa['question'].lower() and qa['score'] < 2 for qa in questions_answers):
-            improvements.append("Review pivot table creation, calculated fields, and advanced data analysis techniques")
-        if any('formula' in qa['question'].lower() and qa['score'] < 2 for qa in questions_answers):
-            improvements.append("Strengthen formula writing, nested functions, and array formula usage")
-        if any('chart' in qa['question'].lower() and qa['score'] < 2 for qa in questions_answers):
-            improvements.append("Improve data visualization techniques and interactive dashboard creation")
-        
-        if total_score >= 8:
-            recommendation = f"Excellent performance at {skill_level} level! You demonstrate strong Excel skills suitable for advanced roles."
-            resources = "- Microsoft's official Power BI and Power Query documentation\n- Advanced Excel courses on LinkedIn Learning or Coursera\n- Excel MVP blogs and forums for cutting-edge techniques"
-        elif total_score >= 5:
-            recommendation = f"Good job at {skill_level} level! You have solid Excel knowledge with room for improvement in specific areas."
-            resources = "- ExcelJet.net for advanced function tutorials\n- Chandoo.org for practical Excel applications\n- YouTube channels like ExcelIsFun for detailed walkthroughs"
-        else:
-            recommendation = f"You're currently at {skill_level} level. Consider additional Excel training and practice to strengthen your technical skills."
-            resources = "- Microsoft's Excel Essentials training\n- GCF Learn Free Excel tutorials\n- YouTube channels like Leila Gharani for beginner-friendly guides"
-        
-        return f"""**Professional Feedback Report**
-
-**Overall Performance Summary:**
-You completed the Excel mock interview with a total score of {total_score}/10 ({percentage:.1f}%), which places you at a {skill_level} level.
-
-**Strengths:**
-{chr(10).join(f"- {strength}" for strength in strengths) if strengths else "- Showed effort in completing all questions"}
-
-**Areas for Improvement:**
-{chr(10).join(f"- {improvement}" for improvement in improvements) if improvements else "- Focus on Excel functions and advanced features"}
-
-**Final Score and Recommendation:**
-Total Score: {total_score}/10
-Recommendation: {recommendation}
-
-**Suggested Resources:**
-{resources}
-
-**Next Steps:**
-- Practice with Excel functions and formulas regularly with real-world datasets
-- Work on pivot tables and data analysis techniques through guided projects
-- Review conditional formatting and data validation for data integrity
-- Consider taking advanced Excel courses for professional development
-- Apply your skills to solve actual business problems to reinforce learning
+    if st.session_state.current_question + 1 < len(DIFFICULTY_LEVELS):
+        st.session_state.current_question += 1
+        st.session_state.current_answer = ""
+        st.session_state.show_submit_all = False
+    else:
+        st.session_state.show_submit_all = True
 
-Remember that Excel proficiency comes with consistent practice. Keep challenging yourself with new problems and techniques!"""
-    
-    return response
+def restore_session():
+    """
+    Tie this browser session to the session token in the URL, issuing one if needed,
+    and load any interview saved under it. Runs once per Streamlit session.
+    """
+    if 'session_token' in st.session_state:
+        return
+    
+    token = st.query_params.get("session")
+    saved = {}
+    if is_valid_token(token):
+        try:
+            saved = get_session_store().load(token)
+        except Exception:
+            increment("session_store_errors_total", operation="load")
+    else:
+        token = new_session_token()
+        st.query_params["session"] = token
+    
+    for key in PERSISTED_SESSION_KEYS:
+        if key in saved:
+            st.session_state[key] = saved[key]
+    if saved:
+        increment("sessions_restored_total")
+    st.session_state.session_token = token
+    st.session_state.stored_session_state = encode_state(saved)
+
+def persist_session():
+    """
+    Save the interview state keys that changed during this run to the session store.
+    A failing store is counted and otherwise ignored so the interview can carry on.
+    """
+    if 'session_token' not in st.session_state:
+        return
+    state = {key: st.session_state[key] for key in PERSISTED_SESSION_KEYS if key in st.session_state}
+    try:
+        st.session_state.stored_session_state = get_session_store().save_changes(
+            st.session_state.session_token, state, st.session_state.stored_session_state
+        )
+    except Exception:
+        increment("session_store_errors_total", operation="save")
 
 def initialize_session_state():
     """Initialize session state variables if they don't exist."""
@@ -429,6 +358,28 @@ def initialize_session_state():
         st.session_state.marked_for_review = [False, False, False, False, False]
     if 'skipped_questions' not in st.session_state:
         st.session_state.skipped_questions = []
+    if 'final_report' not in st.session_state:
+        st.session_state.final_report = None
+    if 'final_report_key' not in st.session_state:
+        st.session_state.final_report_key = None
+    if 'prefetched_questions' not in st.session_state:
+        st.session_state.prefetched_questions = {}
+    if 'adaptive_mode' not in st.session_state:
+        st.session_state.adaptive_mode = False
+    if 'next_question_plan' not in st.session_state:
+        st.session_state.next_question_plan = None
+    if 'answer_evaluations' not in st.session_state:
+        st.session_state.answer_evaluations = {}
+    if 'jobs' not in st.session_state:
+        st.session_state.jobs = {}
+    if 'report_chunks' not in st.session_state:
+        st.session_state.report_chunks = []
+    if 'question_seed' not in st.session_state:
+        # Orders this interview's draws from the question bank so none repeats
+        st.session_state.question_seed = random.getrandbits(32)
+    if 'plan_topics' not in st.session_state:
+        # Topic of each level's question, by level, when the whole interview is planned at the start
+        st.session_state.plan_topics = []
 
 # API test function removed - using self-contained logic
 
@@ -471,20 +422,12 @@ def display_interview_introduction():
 
 def display_agent_thinking(question_number: int):
     """Display agent thinking process."""
-    difficulty_levels = {
-        1: {"level": "Basic", "color": "🟢", "description": "Let me start with fundamental Excel concepts..."},
-        2: {"level": "Intermediate-Basic", "color": "🟡", "description": "Now I'll test your lookup and analysis skills..."},
-        3: {"level": "Intermediate", "color": "🟠", "description": "Time to evaluate your data analysis capabilities..."},
-        4: {"level": "Advanced-Intermediate", "color": "🔴", "description": "Let's see how you handle complex formulas..."},
-        5: {"level": "Advanced", "color": "🟣", "description": "Final challenge - advanced automation and dashboards..."}
-    }
-    
-    current_level = difficulty_levels[question_number]
+    current_level = DIFFICULTY_LEVELS[question_number]
     
     st.markdown(f"""
     <div style="background-color: #374151; padding: 1rem; border-radius: 8px; margin: 1rem 0;">
         <p style="color: #e5e7eb; margin: 0;">
-            <strong>🤖 Agent Thinking:</strong> {current_level['description']}
+            <strong>🤖 Agent Thinking:</strong> {current_level['thinking']}
         </p>
     </div>
     """, unsafe_allow_html=True)
@@ -501,154 +444,13 @@ def display_agent_evaluation():
 
 def main():
     """Main Streamlit application with structured interview flow."""
+    restore_session()
     initialize_session_state()
+    start_metrics_server()
     
 
-    st.markdown("""
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .question-box {
-        background-color: #2d3748;
-        color: #ffffff;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 5px solid #1f77b4;
-        margin: 1rem 0;
-        border: 1px solid #4a5568;
-    }
-    .answer-box {
-        background-color: #2d3748;
-        color: #ffffff;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-        border: 1px solid #4a5568;
-    }
-    .score-box {
-        background-color: #2d3748;
-        color: #ffffff;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-        border: 1px solid #4a5568;
-    }
-    .report-box {
-        background-color: #2d3748;
-        color: #ffffff;
-        padding: 2rem;
-        border-radius: 10px;
-        border: 2px solid #1f77b4;
-        margin: 2rem 0;
-        box-shadow: 0 6px 12px rgba(0, 0, 0, 0.2);
-    }
-    .agent-message {
-        background-color: #1e3a8a;
-        color: #ffffff;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-        border-left: 4px solid #3b82f6;
-    }
-    .submit-all-btn {
-        background-color: #1f77b4;
-        color: white;
-        font-weight: bold;
-        padding: 0.75rem;
-        border-radius: 8px;
-        text-align: center;
-        margin: 1rem 0;
-        cursor: pointer;
-    }
-    .stButton>button {
-        transition: all 0.3s ease;
-    }
-    .stButton>button:hover {
-        background-color: #45a049;
-        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
-    }
-    .submit-all-button button {
-        background-color: #2196F3 !important;
-        color: white !important;
-        font-weight: bold !important;
-        font-size: 1.1rem !important;
-        padding: 0.5rem 1rem !important;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1) !important;
-    }
-    .submit-all-button button:hover {
-        background-color: #0b7dda !important;
-        box-shadow: 0 6px 10px rgba(0, 0, 0, 0.2) !important;
-    }
-    .question-item {
-        border-bottom: 1px solid #4a5568;
-        padding-bottom: 15px;
-        margin-bottom: 15px;
-    }
-    .question-text {
-        font-weight: 600;
-        color: #e2e8f0;
-        margin-bottom: 10px;
-    }
-    .user-answer {
-        background-color: #1a202c;
-        padding: 10px;
-        border-radius: 5px;
-        margin-bottom: 10px;
-        border-left: 3px solid #4a5568;
-    }
-    .correct-answer {
-        background-color: #1a3e2c;
-        padding: 10px;
-        border-radius: 5px;
-        border-left: 4px solid #4caf50;
-        margin-bottom: 10px;
-    }
-    .score-indicator {
-        font-weight: bold;
-        padding: 3px 8px;
-        border-radius: 12px;
-        display: inline-block;
-        margin-left: 10px;
-    }
-    .score-0 {
-        background-color: #5c1e1e;
-        color: #ff8a8a;
-    }
-    .score-1 {
-        background-color: #5c4d1e;
-        color: #ffd78a;
-    }
-    .score-2 {
-        background-color: #1e5c2f;
-        color: #8aff8a;
-    }
-    .report-section {
-        margin-bottom: 20px;
-        border-left: 3px solid #3b82f6;
-        padding-left: 15px;
-    }
-    .report-section h3 {
-        border-bottom: 2px solid #3b82f6;
-        padding-bottom: 5px;
-        color: #e2e8f0;
-    }
-    .report-summary {
-        background-color: #1e3a5a;
-        padding: 15px;
-        border-radius: 8px;
-        margin-bottom: 20px;
-    }
-    .marked-review {
-        border-left: 4px solid #ff9800;
-        padding-left: 10px;
-        background-color: #3d3223;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # The stylesheet is built once at import; it has to be re-sent each run or Streamlit drops it
+    st.markdown(APP_STYLE, unsafe_allow_html=True)
     
    
     st.markdown('<h1 class="main-header">📊 Excel Mock Interview Agent</h1>', unsafe_allow_html=True)
@@ -658,51 +460,81 @@ def main():
     if not st.session_state.interview_started:
         display_interview_introduction()
         
+        st.session_state.adaptive_mode = st.checkbox(
+            "🎯 Adaptive difficulty - questions adjust to your answers, and the interview ends early once your level is clear",
+            value=st.session_state.adaptive_mode
+        )
+        
         col1, col2, col3 = st.columns([1, 1, 1])
         with col2:
             if st.button("🚀 Start Interview", type="primary", use_container_width=True):
                 st.session_state.interview_started = True
+                # Adaptive interviews only know each level once the previous answer is scored
+                if not st.session_state.adaptive_mode:
+                    prefetch_interview_plan()
                 st.rerun()
     
 
     elif st.session_state.interview_started and not st.session_state.interview_complete:
+        if st.session_state.adaptive_mode:
+            apply_question_plan()
    
-        display_agent_thinking(st.session_state.current_question + 1)
+        level = upcoming_level()
+        if level is not None:
+            display_agent_thinking(level)
         
 
-        progress = (st.session_state.current_question) / 5
+        # An adaptive interview can end early, so its question count is only an upper bound
+        question_limit = ADAPTIVE_MAX_QUESTIONS if st.session_state.adaptive_mode else len(DIFFICULTY_LEVELS)
+        question_number = st.session_state.current_question + 1
+        counter = f"{question_number} of up to {question_limit}" if st.session_state.adaptive_mode else f"{question_number}/{question_limit}"
+        progress = min(st.session_state.current_question / question_limit, 1.0)
         col1, col2 = st.columns([3, 1])
         with col1:
             st.progress(progress)
         with col2:
-            st.markdown(f"<div style='text-align: center; padding: 5px; background-color: #1E1E1E; border-radius: 5px;'><strong>{st.session_state.current_question + 1}/5</strong> Questions</div>", unsafe_allow_html=True)
+            st.markdown(f"<div style='text-align: center; padding: 5px; background-color: #1E1E1E; border-radius: 5px;'><strong>{counter}</strong> Questions</div>", unsafe_allow_html=True)
         
 
         if st.session_state.current_question == len(st.session_state.questions_answers):
-            with st.spinner("Generating your next question..."):
-                question_number = st.session_state.current_question + 1
-                question = generate_excel_question(question_number)
-                st.session_state.questions_answers.append({
-                    'question': question,
-                    'answer': '',
-                    'score': 0,
-                    'explanation': '',
-                    'difficulty_level': question_number
-                })
+            if st.session_state.adaptive_mode:
+                # Choosing the question may wait on answers still being scored, so it runs as a job
+                if not st.session_state.next_question_plan:
+                    wait_for_job(start_question_plan(), "Choosing your next question...")
+                    return
+                level, topic = st.session_state.next_question_plan
+            else:
+                level = st.session_state.current_question + 1
+                topic = plan_topic(level)
+            
+            # The question is usually already prefetched; if not, poll for it rather than block
+            prefetch_question(level, topic)
+            prefetched = st.session_state.prefetched_questions[level]
+            if not prefetched.done():
+                wait_for_job(prefetched, "Generating your next question...")
+                return
+            st.session_state.prefetched_questions.pop(level)
+            st.session_state.next_question_plan = None
+            question, reference_answer = prefetched.result()
+            st.session_state.questions_answers.append({
+                'question': question,
+                'answer': '',
+                'score': 0,
+                'explanation': '',
+                'difficulty_level': level,
+                'topic': topic,
+                'reference_answer': reference_answer
+            })
+        
+        # Start on the next level's question while the candidate answers this one;
+        # adaptive interviews only know the next level once this answer is scored
+        if not st.session_state.adaptive_mode:
+            next_level = len(st.session_state.questions_answers) + 1
+            prefetch_question(next_level, plan_topic(next_level))
         
         current_qa = st.session_state.questions_answers[st.session_state.current_question]
   
-        difficulty_levels = {
-            1: {"level": "Basic", "color": "🟢"},
-            2: {"level": "Intermediate-Basic", "color": "🟡"},
-            3: {"level": "Intermediate", "color": "🟠"},
-            4: {"level": "Advanced-Intermediate", "color": "🔴"},
-            5: {"level": "Advanced", "color": "🟣"}
-        }
-        
-        current_difficulty = difficulty_levels.get(st.session_state.current_question + 1, {"level": "Unknown", "color": "⚪"})
         
-       
         st.markdown(f"""
         <div class="agent-message">
             <h3>Question {st.session_state.current_question + 1}</h3>
@@ -716,6 +548,7 @@ def main():
             "Provide your detailed answer here:",
             value="",  # Remove the default value from session state
             height=200,
+            max_chars=MAX_ANSWER_CHARS,
             placeholder="Type your answer here... Be specific and include relevant Excel functions, steps, or formulas."
         )
         
@@ -731,6 +564,8 @@ def main():
             if st.button("📝 Save Answer", use_container_width=True):
                 st.session_state.current_answer = answer
                 st.session_state.questions_answers[st.session_state.current_question]['answer'] = answer
+                if answer.strip():
+                    score_answer_in_background(st.session_state.current_question)
                 st.success("Answer saved!")
         
         with col2:
@@ -743,13 +578,8 @@ def main():
                 if answer.strip():
                     st.session_state.questions_answers[st.session_state.current_question]['answer'] = answer
                 
-                # Move to next question
-                if st.session_state.current_question < 4:
-                    st.session_state.current_question += 1
-                    st.session_state.current_answer = ""
-                else:
-                    # All questions viewed, show submit all button
-                    st.session_state.show_submit_all = True
+                # Move to next question, or show the submit all button after the last one
+                advance_question()
                 
                 st.rerun()
         
@@ -765,19 +595,19 @@ def main():
                     if st.session_state.current_question in st.session_state.skipped_questions:
                         st.session_state.skipped_questions.remove(st.session_state.current_question)
                     
-                    # Move to next question or show submit all button
-                    st.session_state.current_question += 1
-                    st.session_state.current_answer = ""
+                    score_answer_in_background(st.session_state.current_question)
                     
-                    if st.session_state.current_question >= 5:
-                        # All questions answered, show submit all button
-                        st.session_state.current_question = 4  # Keep at last question
-                        st.session_state.show_submit_all = True
+                    # Move to next question or show submit all button
+                    advance_question()
                     
                     st.rerun()
         
+        # An adaptive interview moves on once the answer is scored; the page stays usable meanwhile
+        if "plan" in st.session_state.jobs:
+            wait_for_job(st.session_state.jobs["plan"], "Scoring your answer to choose the next question...")
+        
         # Show submit all button when all questions are answered
-        if st.session_state.current_question == 4 and st.session_state.get('show_submit_all', False):
+        if st.session_state.get('show_submit_all', False):
             st.markdown("---")
             st.markdown("### 🎯 Ready to Submit All Answers")
             st.markdown("You've completed all questions! Click below to submit all your answers for evaluation.")
@@ -801,8 +631,19 @@ def main():
             </div>
             """, unsafe_allow_html=True)
             
-            # Evaluate all answers
-            st.session_state.questions_answers = evaluate_all_answers(st.session_state.questions_answers)
+            # Most answers were scored in the background during the interview; evaluate the rest
+            start_job(
+                "evaluation",
+                evaluate_with_background_scores,
+                [dict(qa) for qa in st.session_state.questions_answers],
+                list(st.session_state.skipped_questions),
+                score_sources(start_missing=False)
+            )
+            finished = finished_job("evaluation")
+            if finished is None:
+                wait_for_job(st.session_state.jobs["evaluation"], "Evaluating all your answers... This may take a moment.")
+                return
+            st.session_state.questions_answers = finished.result()
             st.session_state.answers_evaluated = True
             st.rerun()
         
@@ -814,35 +655,16 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        # Calculate total score
-        total_score = sum(qa['score'] for qa in st.session_state.questions_answers)
+        # Calculate total score and percentage over the questions asked
+        total_score, percentage_score, skill_level = summarize_scores(st.session_state.questions_answers)
+        available_score = max_score(st.session_state.questions_answers)
         
         # Display individual Q&A summary
         st.markdown("### 📋 Interview Summary")
         
-        # Define correct answers for each question
-        correct_answers = {
-            0: "To calculate the total cost, you would use the SUMPRODUCT function. In cell C7, the formula would be =SUMPRODUCT(A2:A6,B2:B6) which multiplies each item's price by its quantity and then adds all the results together.",
-            1: "To create a dynamic chart that updates automatically, you would: 1) Create a named range for your data (Ctrl+T or Insert > Table), 2) Insert a chart based on this table (Insert > Charts > desired chart type), 3) The chart will automatically update when data in the table changes. You can also use OFFSET or INDEX functions with COUNTA to create dynamic ranges.",
-            2: "To find the last value in column A, you can use: =LOOKUP(2,1/(A:A<>""),A:A) or =INDEX(A:A,MATCH(9.99999999999999E+307,A:A)) or =INDEX(A:A,COUNTA(A:A)). These formulas work even when the data has blank cells or is unsorted.",
-            3: "To create a conditional formatting rule that highlights cells with values above average: 1) Select the range, 2) Go to Home > Conditional Formatting > New Rule, 3) Choose 'Use a formula', 4) Enter =A1>AVERAGE($A$1:$A$100) (adjust range as needed), 5) Click Format and choose highlighting style, 6) Click OK. This will highlight all cells with values above the average of the selected range.",
-            4: "To create a pivot table summarizing sales by region and product: 1) Select your data range, 2) Go to Insert > PivotTable, 3) In the PivotTable Fields pane, drag 'Region' to Rows area, 'Product' to Columns area, and 'Sales' to Values area, 4) The pivot table will automatically calculate the sum of sales for each region-product combination. You can then add filters, change calculation type (e.g., to average), or add additional fields as needed."
-        }
-        
         for i, qa in enumerate(st.session_state.questions_answers, 1):
-            score_colors = {0: "score-0", 1: "score-1", 2: "score-2"}
-            score_texts = {0: "Needs Improvement", 1: "Good Understanding", 2: "Excellent Response"}
-            
-            # Get difficulty level for display
-            difficulty_levels = {
-                1: {"level": "Basic", "color": "🟢"},
-                2: {"level": "Intermediate-Basic", "color": "🟡"},
-                3: {"level": "Intermediate", "color": "🟠"},
-                4: {"level": "Advanced-Intermediate", "color": "🔴"},
-                5: {"level": "Advanced", "color": "🟣"}
-            }
-            
-            difficulty_info = difficulty_levels.get(i, {"level": "Unknown", "color": "⚪"})
+            level = qa.get('difficulty_level', i)
+            difficulty_info = DIFFICULTY_LEVELS.get(level, UNKNOWN_LEVEL)
             
             # Check if question was marked for review
             marked_class = "marked-review" if st.session_state.marked_for_review[i-1] else ""
@@ -851,70 +673,57 @@ def main():
                 st.markdown(f"<div class='question-item {marked_class}'>", unsafe_allow_html=True)
                 st.markdown(f"<div class='question-text'>Question {i}: {qa['question']}</div>", unsafe_allow_html=True)
                 st.markdown(f"<div class='user-answer'>Your Answer: {qa['answer']}</div>", unsafe_allow_html=True)
-                st.markdown(f"<div class='correct-answer'>Correct Answer: {correct_answers[i-1]}</div>", unsafe_allow_html=True)
-                st.markdown(f"<div>Evaluation: <span class='score-indicator {score_colors[qa['score']]}'>{qa['score']}/2 - {score_texts[qa['score']]}</span></div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='correct-answer'>Correct Answer: {qa.get('reference_answer') or 'No reference answer'}</div>", unsafe_allow_html=True)
+                st.markdown(f"<div>Evaluation: <span class='score-indicator {SCORE_CLASSES[qa['score']]}'>{qa['score']}/2 - {SCORE_LABELS[qa['score']]}</span></div>", unsafe_allow_html=True)
                 st.markdown(f"<div>Feedback: {qa['explanation']}</div>", unsafe_allow_html=True)
                 st.markdown("</div>", unsafe_allow_html=True)
         
         # Generate and display final report
         st.markdown("### 📊 Comprehensive Evaluation Report")
         
-        with st.spinner("Generating comprehensive evaluation report..."):
-            final_report = generate_final_report(st.session_state.questions_answers)
-        
-        # Calculate percentage score
-        percentage_score = (total_score / 10) * 100
-        
         # Display summary score in a nice format
         st.markdown(f"""
         <div class="report-summary">
-            <h3>Overall Score: {total_score}/10 ({percentage_score:.1f}%)</h3>
+            <h3>Overall Score: {total_score}/{available_score} ({percentage_score:.1f}%)</h3>
         </div>
         """, unsafe_allow_html=True)
         
-        # Determine performance level
-        if percentage_score >= 90:
-            performance_level = "🌟 Expert"
-            performance_class = "score-2"
-        elif percentage_score >= 75:
-            performance_level = "✨ Advanced"
-            performance_class = "score-2"
-        elif percentage_score >= 60:
-            performance_level = "🔵 Intermediate"
-            performance_class = "score-1"
-        elif percentage_score >= 40:
-            performance_level = "🟡 Basic"
-            performance_class = "score-1"
-        else:
-            performance_level = "🔴 Beginner"
-            performance_class = "score-0"
-        
-        # Parse the final report to apply our custom styling
-        # Process the final report without fancy formatting
-        sections = final_report.split('**')
-        formatted_report = ""
-        
-        for i, section in enumerate(sections):
-            if i == 0:  # Skip the first empty section
-                continue
-                
-            if i % 2 == 1:  # Section titles
-                section_title = section.strip(':*')
-                formatted_report += f"### {section_title}\n\n"
-            else:  # Section content
-                content = section.strip()
-                formatted_report += f"{content}\n\n"
+        performance_level = f"{SKILL_BAND_ICONS[skill_level]} {skill_level}"
         
         st.markdown(f"""
         ### Final Assessment
         
-        **Overall Score: {total_score}/10 ({percentage_score:.0f}%)**
+        **Overall Score: {total_score}/{available_score} ({percentage_score:.0f}%)**
         
         **Performance Level: {performance_level}**
-        
-        {formatted_report}
         """)
         
+        # Generate the report once per scored interview, as a background job; widget reruns reuse the cached copy
+        report_key = questions_answers_digest(st.session_state.questions_answers)
+        report_job = f"report:{report_key}"
+        if st.session_state.final_report_key != report_key and report_job not in st.session_state.jobs:
+            increment("report_cache_lookups_total", result="miss")
+            questions_answers = [dict(qa) for qa in st.session_state.questions_answers]
+            st.session_state.report_chunks = []
+            if STREAM_FINAL_REPORT:
+                # The job appends chunks as they stream in, so the partial report can be shown meanwhile
+                start_job(report_job, stream_report_into, questions_answers, st.session_state.report_chunks)
+            else:
+                start_job(report_job, generate_final_report, questions_answers)
+        elif st.session_state.final_report_key == report_key:
+            increment("report_cache_lookups_total", result="hit")
+        
+        finished = finished_job(report_job)
+        if finished is not None:
+            st.session_state.final_report = finished.result()
+            st.session_state.final_report_key = report_key
+        
+        if st.session_state.final_report_key == report_key:
+            # Parse the final report to apply our custom styling
+            st.markdown(format_report(st.session_state.final_report))
+        else:
+            show_report_progress(st.session_state.jobs[report_job], st.session_state.report_chunks)
+        
         # Conclusion
         st.markdown("""
         ### Interview Complete
@@ -928,10 +737,14 @@ def main():
         with col2:
             if st.button("🔄 Take Another Interview", type="primary", use_container_width=True):
                 # Reset session state
-                for key in ['interview_started', 'current_question', 'questions_answers', 'current_answer', 'interview_complete', 'answers_evaluated', 'show_submit_all']:
+                for key in ['interview_started', 'current_question', 'questions_answers', 'current_answer', 'interview_complete', 'answers_evaluated', 'show_submit_all', 'marked_for_review', 'skipped_questions', 'final_report', 'final_report_key', 'prefetched_questions', 'next_question_plan', 'answer_evaluations', 'jobs', 'report_chunks', 'question_seed', 'plan_topics']:
                     if key in st.session_state:
                         del st.session_state[key]
                 st.rerun()
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        # Also runs when st.rerun() cuts the script short, so no change is lost
+        persist_session()
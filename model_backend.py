@@ -0,0 +1,251 @@
+import collections
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Deque, Dict, Iterator, NamedTuple, Optional
+
+
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "YOUR_API_KEY")
+GEMINI_MODEL_NAME = os.environ.get("GEMINI_MODEL_NAME", "gemini-1.5-flash")
+
+# "gemini" talks to the real API; "fake" serves canned responses locally, e.g. for benchmarks
+LLM_BACKEND = os.environ.get("LLM_BACKEND", "gemini")
+FAKE_LLM_LATENCY_SECONDS = float(os.environ.get("FAKE_LLM_LATENCY_SECONDS", "0.2"))
+FAKE_LLM_ERROR_RATE = float(os.environ.get("FAKE_LLM_ERROR_RATE", "0"))
+FAKE_LLM_QUOTA_PER_MINUTE = int(os.environ.get("FAKE_LLM_QUOTA_PER_MINUTE", "0")) or None
+FAKE_LLM_SEED = int(os.environ.get("FAKE_LLM_SEED", "0"))
+
+
+class ModelResponse(NamedTuple):
+    """Text of a completion (or of one streamed chunk) with its token usage."""
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class GeminiBackend:
+    """
+    Backend calling Google Gemini through the google-generativeai client.
+
+    The client library takes most of a second to import, so it is only loaded
+    when the backend is first created, not when the app starts.
+    """
+
+    def __init__(self, model_name: str = GEMINI_MODEL_NAME, api_key: str = GEMINI_API_KEY):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self._model = genai.GenerativeModel(model_name)
+        self._generation_config = genai.types.GenerationConfig
+
+    @staticmethod
+    def _to_response(response) -> ModelResponse:
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return ModelResponse(response.text)
+        return ModelResponse(response.text, usage.prompt_token_count, usage.candidates_token_count)
+
+    def generate(
+        self,
+        prompt: str,
+        max_output_tokens: int,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        response_schema: Optional[Dict] = None
+    ) -> ModelResponse:
+        """Generate a completion; with a response schema the model replies with JSON matching it."""
+        structured = {"response_mime_type": "application/json", "response_schema": response_schema} if response_schema else {}
+        response = self._model.generate_content(
+            prompt,
+            generation_config=self._generation_config(
+                max_output_tokens=max_output_tokens,
+                temperature=temperature,
+                **structured
+            ),
+            request_options={"timeout": timeout} if timeout else None
+        )
+        return self._to_response(response)
+
+    def stream(self, prompt: str, max_output_tokens: int, temperature: float = 0.7) -> Iterator[ModelResponse]:
+        """Yield chunks as they arrive; the last one carries the token usage of the whole response."""
+        response = self._model.generate_content(
+            prompt,
+            generation_config=self._generation_config(
+                max_output_tokens=max_output_tokens,
+                temperature=temperature,
+            ),
+            stream=True
+        )
+        for chunk in response:
+            yield self._to_response(chunk)
+
+
+class FakeLLMError(Exception):
+    """Injected server error; the status code makes the scheduler treat it as transient."""
+    code = 500
+
+
+class FakeQuotaExceeded(FakeLLMError):
+    """Injected quota exhaustion, reported like the API's HTTP 429."""
+    code = 429
+
+
+def _count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class FakeBackend:
+    """
+    Local stand-in for Gemini with configurable latency, error rate and quota.
+
+    Responses are a deterministic function of the prompt and seed, shaped like
+    what the app's prompts ask for (a JSON question, an interview plan, a JSON score,
+    a JSON array of scores or a feedback report), so the whole interview flow runs without a
+    network. Latency varies by +/- 50% around latency_seconds. Every call counts
+    against quota_per_minute, if set; calls over it fail with HTTP 429.
+    """
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.2,
+        error_rate: float = 0.0,
+        quota_per_minute: Optional[int] = None,
+        seed: int = 0
+    ):
+        self.latency_seconds = latency_seconds
+        self.error_rate = error_rate
+        self.quota_per_minute = quota_per_minute
+        self.seed = seed
+        self.calls = 0
+        self.errors = 0
+        self.quota_rejections = 0
+        self._random = random.Random(seed)
+        self._recent_calls: Deque[float] = collections.deque()
+        self._lock = threading.Lock()
+
+    def _digest(self, prompt: str) -> int:
+        return int.from_bytes(hashlib.sha256(f"{self.seed}:{prompt}".encode("utf-8")).digest()[:8], "big")
+
+    def _admit(self) -> float:
+        """Count the call, raise any injected failure and return the simulated latency."""
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            latency = self.latency_seconds * self._random.uniform(0.5, 1.5)
+            if self.quota_per_minute is not None:
+                while self._recent_calls and self._recent_calls[0] <= now - 60:
+                    self._recent_calls.popleft()
+                if len(self._recent_calls) >= self.quota_per_minute:
+                    self.quota_rejections += 1
+                    raise FakeQuotaExceeded("429 Resource has been exhausted (fake quota)")
+                self._recent_calls.append(now)
+            if self._random.random() < self.error_rate:
+                self.errors += 1
+                raise FakeLLMError("500 Internal error (injected)")
+        return latency
+
+    def respond(self, prompt: str) -> str:
+        """Build the canned completion for a prompt."""
+        digest = self._digest(prompt)
+        # The report prompt quotes each answer's score, so it has to be recognised first
+        if "feedback report" in prompt:
+            return (
+                "**Overall Performance Summary**\nSimulated summary of the candidate's performance.\n"
+                "**Strengths**\nSimulated strengths.\n"
+                "**Areas for Improvement**\nSimulated areas for improvement.\n"
+                "**Specific Recommendations**\nSimulated recommendations.\n"
+                "**Final Score and Recommendation**\nSimulated recommendation."
+            )
+        if "interview plan" in prompt:
+            levels = [int(level) for level in re.findall(r"^Level (\d+) \(", prompt, re.MULTILINE)]
+            topics = re.findall(r"^Level \d+ \([^)]*\): (.+?) - ", prompt, re.MULTILINE)
+            return json.dumps([
+                {
+                    "level": level,
+                    "question": f"How would you use {topic} in scenario #{(digest >> level) % 1000}?",
+                    "reference_answer": f"Apply {topic} to the data and check the result."
+                }
+                for level, topic in zip(levels, topics)
+            ])
+        if "JSON array" in prompt:
+            ids = sorted({int(i) for i in re.findall(r"^\s*Answer (\d+):", prompt, re.MULTILINE)})
+            return json.dumps([
+                {"id": i, "score": (digest >> i) % 3, "explanation": f"Simulated evaluation of answer {i}"}
+                for i in ids
+            ])
+        topic = re.search(r"Focus Topic: (.+)", prompt)
+        if topic:
+            return json.dumps({
+                "question": f"How would you use {topic.group(1).strip()} in scenario #{digest % 1000}?",
+                "reference_answer": f"Apply {topic.group(1).strip()} to the data and check the result."
+            })
+        if "JSON object" in prompt:
+            score = digest % 3
+            return json.dumps({"score": score, "explanation": f"Simulated evaluation with score {score}"})
+        return f"How would you use Excel in scenario #{digest % 1000}?"
+
+    def generate(
+        self,
+        prompt: str,
+        max_output_tokens: int,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        response_schema: Optional[Dict] = None
+    ) -> ModelResponse:
+        latency = self._admit()
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("fake request timed out")
+        time.sleep(latency)
+        text = self.respond(prompt)
+        return ModelResponse(text, _count_tokens(prompt), _count_tokens(text))
+
+    def stream(self, prompt: str, max_output_tokens: int, temperature: float = 0.7) -> Iterator[ModelResponse]:
+        """Yield the response in a few chunks, spending half the latency before the first one."""
+        latency = self._admit()
+        text = self.respond(prompt)
+        lines = text.splitlines(keepends=True)
+        time.sleep(latency / 2)
+        for i, line in enumerate(lines):
+            if i == len(lines) - 1:
+                yield ModelResponse(line, _count_tokens(prompt), _count_tokens(text))
+            else:
+                yield ModelResponse(line)
+                time.sleep(latency / 2 / len(lines))
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    Return the process-wide model backend selected by LLM_BACKEND, creating it on first use.
+    Once created it is returned without taking the lock.
+    """
+    global _backend
+    if _backend is not None:
+        return _backend
+    with _backend_lock:
+        if _backend is None:
+            if LLM_BACKEND == "fake":
+                _backend = FakeBackend(
+                    latency_seconds=FAKE_LLM_LATENCY_SECONDS,
+                    error_rate=FAKE_LLM_ERROR_RATE,
+                    quota_per_minute=FAKE_LLM_QUOTA_PER_MINUTE,
+                    seed=FAKE_LLM_SEED
+                )
+            else:
+                _backend = GeminiBackend()
+        return _backend
+
+
+def set_backend(backend) -> None:
+    """Replace the process-wide backend, e.g. with a FakeBackend for benchmarks."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
@@ -0,0 +1,185 @@
+import os
+import re
+from typing import Optional
+
+import metrics
+
+
+# Rough local token estimate; Gemini averages about four characters per token on English text
+CHARS_PER_TOKEN = 4
+
+# Longest answer, in characters, the answer box accepts
+MAX_ANSWER_CHARS = int(os.environ.get("MAX_ANSWER_CHARS", "8000"))
+
+TRUNCATION_MARKER = " [...] "
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text without calling the model."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def compact(template: str) -> str:
+    """
+    Strip the indentation and trailing spaces of every line of a template and
+    collapse runs of blank lines, so none of it is sent with every request.
+    """
+    lines = [line.strip() for line in template.strip().splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Shorten a text to about max_tokens, keeping its opening two thirds and its
+    closing third (where answers usually state their approach and conclusion),
+    cut at word boundaries.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    keep = max(0, max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER))
+    head_chars = keep * 2 // 3
+    tail_chars = keep - head_chars
+    head, tail = text[:head_chars], text[len(text) - tail_chars:] if tail_chars else ""
+    # Drop the words the cuts went through
+    if head and not text[head_chars].isspace():
+        head = head.rsplit(None, 1)[0] if len(head.split()) > 1 else ""
+    if tail and not text[len(text) - tail_chars - 1].isspace():
+        tail = tail.split(None, 1)[-1] if len(tail.split()) > 1 else ""
+    return f"{head.rstrip()}{TRUNCATION_MARKER}{tail.lstrip()}".strip()
+
+
+class PromptTemplate:
+    """
+    A prompt for one call site, compacted once when it is defined and filled in with str.format.
+
+    Each answer placed in it is first clipped to answer_tokens. If the rendered
+    prompt is still over the call site's token budget, the `shrink` field is cut
+    down until it fits. Every cut is counted in prompt_truncations_total.
+    """
+
+    def __init__(self, call_site: str, template: str, budget: int, shrink: Optional[str] = None, answer_tokens: Optional[int] = None):
+        self.call_site = call_site
+        self.text = compact(template)
+        self.budget = budget
+        self.shrink = shrink
+        self.answer_tokens = answer_tokens
+
+    def clip(self, answer: str) -> str:
+        """Truncate one candidate answer to this call site's per-answer limit."""
+        if self.answer_tokens is None or count_tokens(answer) <= self.answer_tokens:
+            return answer
+        metrics.increment("prompt_truncations_total", call_site=self.call_site, field="answer")
+        return truncate_to_tokens(answer, self.answer_tokens)
+
+    def render(self, **fields) -> str:
+        prompt = self.text.format(**fields)
+        excess = count_tokens(prompt) - self.budget
+        if excess > 0 and self.shrink is not None:
+            value = str(fields[self.shrink])
+            fields[self.shrink] = truncate_to_tokens(value, max(0, count_tokens(value) - excess))
+            prompt = self.text.format(**fields)
+            metrics.increment("prompt_truncations_total", call_site=self.call_site, field=self.shrink)
+        return prompt
+
+
+QUESTION_PROMPT = PromptTemplate("question", """
+    Generate a specific, practical Excel interview question for a {level} level candidate.
+
+    Difficulty Level: {level}
+    Focus Topic: {topic}
+    Description: {description}
+
+    The question should:
+    - Match the {level} difficulty level
+    - Be realistic and job-relevant
+    - Test appropriate Excel skills for this level
+    - Require a detailed answer
+    - Be clear and specific
+    - Progress naturally from basic to advanced concepts
+
+    Examples by level:
+    - Basic: "How would you calculate the sum of values in column A using a formula?"
+    - Intermediate: "How would you use VLOOKUP to find a product price based on its ID?"
+    - Advanced: "How would you create a dynamic dashboard with pivot tables and slicers?"
+
+    Generate a {level} level question about {topic}, with a concise model answer (2-4 sentences) naming the functions, formulas or steps a strong candidate would give.
+    Respond with only a JSON object in this exact format:
+    {{"question": "The question text", "reference_answer": "The model answer"}}
+""", budget=350)
+
+INTERVIEW_PLAN_PROMPT = PromptTemplate("interview_plan", """
+    Generate the questions for an Excel interview plan, one specific, practical question per difficulty level.
+
+    {slots}
+
+    Each question should:
+    - Match its difficulty level and cover only its own focus topic
+    - Be realistic and job-relevant
+    - Require a detailed answer
+    - Be clear and specific
+
+    Examples by level:
+    - Basic: "How would you calculate the sum of values in column A using a formula?"
+    - Intermediate: "How would you use VLOOKUP to find a product price based on its ID?"
+    - Advanced: "How would you create a dynamic dashboard with pivot tables and slicers?"
+
+    Give each question a concise model answer (2-4 sentences) naming the functions, formulas or steps a strong candidate would give.
+    Respond with only a JSON array containing one object per level, in this exact format:
+    [{{"level": 1, "question": "The question text", "reference_answer": "The model answer"}}]
+""", budget=600)
+
+EVALUATION_PROMPT = PromptTemplate("evaluation", """
+    Evaluate this Excel interview answer and provide a score and brief explanation.
+
+    Question: {question}
+    Answer: {answer}
+
+    Scoring criteria:
+    - 0: Incorrect or completely wrong approach
+    - 1: Partially correct but missing key elements or has errors
+    - 2: Correct and comprehensive answer
+
+    Respond with only a JSON object in this exact format:
+    {{"score": 0, "explanation": "One-line explanation of the score"}}
+
+    Be fair but thorough in your evaluation. Focus on technical accuracy and completeness.
+""", budget=1200, shrink="answer", answer_tokens=1000)
+
+BATCH_EVALUATION_PROMPT = PromptTemplate("batch_evaluation", """
+    Evaluate each of these Excel interview answers and provide a score and brief explanation for each.
+
+    {qa_block}
+    Scoring criteria:
+    - 0: Incorrect or completely wrong approach
+    - 1: Partially correct but missing key elements or has errors
+    - 2: Correct and comprehensive answer
+
+    Respond with only a JSON array containing one object per question, in this exact format:
+    [{{"id": 1, "score": 0, "explanation": "One-line explanation of the score"}}]
+
+    Be fair but thorough in your evaluation. Focus on technical accuracy and completeness.
+""", budget=3500, shrink="qa_block", answer_tokens=500)
+
+REPORT_PROMPT = PromptTemplate("report", """
+    Generate a professional interview feedback report for an Excel mock interview.
+
+    Interview Summary:
+    {qa_summary}
+
+    Total Score: {total_score}/{max_score} ({percentage:.1f}%), which puts the candidate at a {skill_level} level.
+
+    Create a professional feedback report with these sections:
+    1. Overall Performance Summary - include specific strengths demonstrated
+    2. Strengths (areas where candidate performed well) - be specific about which Excel skills they demonstrated proficiency in
+    3. Areas for Improvement (weaknesses) - provide detailed analysis based on questions they struggled with
+    4. Specific Recommendations - include actionable steps and suggested resources tailored to their skill gaps
+    5. Final Score and Recommendation - with a motivational conclusion that encourages continued learning
+
+    Be constructive, specific, and professional. Focus on Excel skills and provide actionable feedback that will help them improve their Excel skills for real-world applications.
+
+    Important formatting guidelines:
+    - Do not include any placeholder text like [Candidate Name] or [Interviewer Name]
+    - Do not use asterisks (*) for formatting - use proper markdown formatting instead
+    - Focus only on genuine evaluation terms and feedback
+    - Make sure all sections are properly formatted with clear headings
+""", budget=2500, shrink="qa_summary", answer_tokens=300)
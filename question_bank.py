@@ -0,0 +1,217 @@
+"""
+File-backed bank of interview questions, indexed by difficulty level and topic.
+
+The bank is a SQLite file that is opened on first use and seeded with the
+built-in questions if it is empty. Larger banks are loaded from JSON lines
+files of {"level", "topic", "question", "reference_answer"} objects, the
+reference answer being optional:
+
+    python -m question_bank questions.jsonl [more.jsonl ...]
+
+Near-duplicates of questions already in the bank are skipped on import.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from catalog import BANK_SEED_QUESTIONS
+from question_index import QuestionIndex
+
+
+QUESTION_BANK_PATH = os.environ.get("QUESTION_BANK_PATH", "question_bank.db")
+
+
+def affine_position(seed: int, group: str, draw: int, size: int) -> int:
+    """
+    Return the position of the draw-th question of a group in a per-seed shuffle of its `size` questions.
+
+    The shuffle is the affine permutation k -> (a * k + b) mod size, with a
+    coprime to size, so draws 0 .. size - 1 visit every position exactly once
+    without storing anything but the seed.
+    """
+    digest = hashlib.blake2b(f"{seed}:{group}".encode("utf-8"), digest_size=16).digest()
+    a = int.from_bytes(digest[:8], "big") % size or 1
+    while math.gcd(a, size) != 1:
+        a += 1
+    b = int.from_bytes(digest[8:], "big") % size
+    return (a * draw + b) % size
+
+
+class QuestionBank:
+    """
+    Questions stored in SQLite, numbered 0 .. n - 1 within each level and within each (level, topic).
+
+    The group sizes are read once, on the first draw; fetching a question by its
+    number is then a single indexed lookup, however large the bank is.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._sizes: Optional[Dict[Tuple[int, Optional[str]], int]] = None
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS questions (
+                    id INTEGER PRIMARY KEY,
+                    level INTEGER NOT NULL,
+                    topic TEXT NOT NULL,
+                    question TEXT NOT NULL UNIQUE,
+                    level_slot INTEGER NOT NULL,
+                    topic_slot INTEGER NOT NULL,
+                    reference_answer TEXT
+                )"""
+            )
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(questions)")]
+            if "reference_answer" not in columns:
+                self._conn.execute("ALTER TABLE questions ADD COLUMN reference_answer TEXT")
+            self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS questions_level_slot ON questions (level, level_slot)")
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS questions_topic_slot ON questions (level, topic, topic_slot)"
+            )
+
+    def _load_sizes(self) -> Dict[Tuple[int, Optional[str]], int]:
+        if self._sizes is None:
+            sizes: Dict[Tuple[int, Optional[str]], int] = {}
+            rows = self._conn.execute("SELECT level, topic, COUNT(*) FROM questions GROUP BY level, topic").fetchall()
+            for level, topic, count in rows:
+                sizes[(level, topic)] = count
+                sizes[(level, None)] = sizes.get((level, None), 0) + count
+            self._sizes = sizes
+        return self._sizes
+
+    def size(self, level: Optional[int] = None, topic: Optional[str] = None) -> int:
+        """Return the number of questions for a level and topic, a whole level, or the whole bank."""
+        with self._lock:
+            sizes = self._load_sizes()
+            if level is None:
+                return sum(count for (_, group_topic), count in sizes.items() if group_topic is None)
+            return sizes.get((level, topic), 0)
+
+    def draw(self, level: int, seed: int, draw: int, topic: Optional[str] = None) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Return the draw-th (question, reference answer) of the level (and topic, if given) in the shuffle for `seed`.
+
+        A candidate who keeps one seed and never reuses a draw number sees no
+        question twice until the group is exhausted. Returns None for an empty group.
+        """
+        with self._lock:
+            size = self._load_sizes().get((level, topic), 0)
+            if size == 0:
+                return None
+            position = affine_position(seed, f"{level}:{topic or ''}", draw, size)
+            if topic is None:
+                row = self._conn.execute(
+                    "SELECT question, reference_answer FROM questions WHERE level = ? AND level_slot = ?",
+                    (level, position)
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT question, reference_answer FROM questions WHERE level = ? AND topic = ? AND topic_slot = ?",
+                    (level, topic, position)
+                ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def reference_answer(self, question: str) -> Optional[str]:
+        """Return the reference answer stored with a question, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT reference_answer FROM questions WHERE question = ?", (question,)).fetchone()
+        return row[0] if row else None
+
+    def add_many(
+        self,
+        entries: Iterable[Tuple[int, str, str, Optional[str]]],
+        index: Optional[QuestionIndex] = None
+    ) -> int:
+        """
+        Append (level, topic, question, reference answer) entries, skipping exact repeats
+        and, with an index, near-duplicates of questions already indexed. Returns the number added.
+        """
+        with self._lock, self._conn:
+            counts: Dict[Tuple[int, Optional[str]], int] = {}
+            for level, topic, count in self._conn.execute(
+                "SELECT level, topic, COUNT(*) FROM questions GROUP BY level, topic"
+            ):
+                counts[(level, topic)] = count
+                counts[(level, None)] = counts.get((level, None), 0) + count
+            added = 0
+            for level, topic, question, reference_answer in entries:
+                question = question.strip()
+                if not question or (index is not None and not index.add(question)):
+                    continue
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO questions (level, topic, question, level_slot, topic_slot, reference_answer) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (level, topic, question, counts.get((level, None), 0), counts.get((level, topic), 0), reference_answer)
+                )
+                if cursor.rowcount:
+                    counts[(level, None)] = counts.get((level, None), 0) + 1
+                    counts[(level, topic)] = counts.get((level, topic), 0) + 1
+                    added += 1
+            self._sizes = None
+        return added
+
+    def questions(self) -> List[str]:
+        """Return every question in the bank, in the order they were added."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT question FROM questions ORDER BY id")]
+
+
+_bank: Optional[QuestionBank] = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    """Return the process-wide question bank, opening it (and seeding an empty one) on first use."""
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            bank = QuestionBank(QUESTION_BANK_PATH)
+            if bank.size() == 0:
+                bank.add_many(BANK_SEED_QUESTIONS, QuestionIndex())
+            _bank = bank
+        return _bank
+
+
+def read_entries(path: str) -> Iterable[Tuple[int, str, str, Optional[str]]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                yield (
+                    int(entry["level"]),
+                    str(entry.get("topic") or ""),
+                    str(entry["question"]),
+                    entry.get("reference_answer") or None
+                )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import questions into the question bank.")
+    parser.add_argument("files", nargs="+", help="JSON lines files of {level, topic, question, reference_answer} objects")
+    parser.add_argument("--bank", default=QUESTION_BANK_PATH, help="question bank database")
+    parser.add_argument("--keep-duplicates", action="store_true", help="import near-duplicates too")
+    args = parser.parse_args(argv)
+
+    bank = QuestionBank(args.bank)
+    index = None
+    if not args.keep_duplicates:
+        index = QuestionIndex(capacity=sys.maxsize)
+        for question in bank.questions():
+            index.add(question)
+    for path in args.files:
+        added = bank.add_many(read_entries(path), index)
+        print(f"{path}: {added} questions added")
+    print(f"{bank.size()} questions in {args.bank}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+# Questions whose shingle sets overlap at least this much (Jaccard similarity) count as near-duplicates
+DUPLICATE_THRESHOLD = 0.5
+
+# Words that carry no meaning for comparing questions; "how would you use X" is shared by most of them
+STOP_WORDS = frozenset("""
+a all an and any are as at based be by can could do does for from how i if in into is it its of on or
+per s some that the their them then there these this to up use using what when where which while who
+why will with would you your
+""".split())
+
+# Mersenne prime modulus for the MinHash permutations
+_PRIME = (1 << 61) - 1
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """
+    Return the set of content words of a question.
+    Words are lowercased, a plural "s" is dropped and stop words are ignored. Word
+    pairs are deliberately left out: paraphrases reorder words far more than they
+    swap them, so pairs mostly dilute the overlap.
+    """
+    words = (word.rstrip("s") if len(word) > 3 else word for word in re.findall(r"[a-z0-9]+", text.lower()))
+    return frozenset(word for word in words if word not in STOP_WORDS)
+
+
+def jaccard(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+def near_duplicate(text: str, others: Iterable[str], threshold: float = DUPLICATE_THRESHOLD) -> bool:
+    """Compare a question directly against a handful of others, e.g. those already asked in one interview."""
+    text_shingles = shingles(text)
+    return any(jaccard(text_shingles, shingles(other)) >= threshold for other in others)
+
+
+def _base_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class QuestionIndex:
+    """
+    MinHash/LSH index over generated questions, for finding near-duplicates without comparing against all of them.
+
+    Each question gets a MinHash signature of num_perm values, split into `bands`
+    bands; questions sharing any band are candidates and are confirmed by their
+    exact Jaccard similarity. With the defaults (32 permutations in 16 bands of 2)
+    a pair at 0.5 similarity becomes a candidate with probability ~99%. Once the
+    index holds `capacity` questions the oldest are forgotten; with
+    max_age_seconds, so are questions indexed longer ago than that.
+
+    Band buckets holding more than max_bucket questions are skipped when looking
+    for candidates: they come from words common to a large share of questions,
+    and real near-duplicates share several other bands anyway. This keeps lookups
+    fast in an index of tens of thousands of questions.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DUPLICATE_THRESHOLD,
+        num_perm: int = 32,
+        bands: int = 16,
+        capacity: int = 5000,
+        seed: int = 1,
+        max_bucket: int = 64,
+        max_age_seconds: Optional[float] = None
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.capacity = capacity
+        self.max_bucket = max_bucket
+        self.max_age_seconds = max_age_seconds
+        digest = hashlib.sha256(str(seed).encode("utf-8")).digest()
+        coefficients = []
+        for i in range(num_perm):
+            block = hashlib.sha256(digest + i.to_bytes(4, "big")).digest()
+            coefficients.append((int.from_bytes(block[:8], "big") % (_PRIME - 1) + 1, int.from_bytes(block[8:16], "big") % _PRIME))
+        self._coefficients = coefficients
+        self._entries: "OrderedDict[str, Tuple[FrozenSet[str], Tuple[int, ...], float]]" = OrderedDict()
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._entries)
+
+    def _signature(self, question_shingles: FrozenSet[str]) -> Tuple[int, ...]:
+        hashes = [_base_hash(shingle) for shingle in question_shingles] or [0]
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._coefficients)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        return [signature[band * self.rows:(band + 1) * self.rows] for band in range(self.bands)]
+
+    def _find(self, question_shingles: FrozenSet[str], signature: Tuple[int, ...]) -> Optional[str]:
+        candidates: Set[str] = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key, ())
+            if len(bucket) <= self.max_bucket:
+                candidates.update(bucket)
+        for candidate in candidates:
+            if jaccard(question_shingles, self._entries[candidate][0]) >= self.threshold:
+                return candidate
+        return None
+
+    def find_duplicate(self, question: str) -> Optional[str]:
+        """Return an indexed question that is a near-duplicate of this one, or None."""
+        question_shingles = shingles(question)
+        signature = self._signature(question_shingles)
+        with self._lock:
+            self._expire()
+            return self._find(question_shingles, signature)
+
+    def add(self, question: str) -> bool:
+        """
+        Index a question unless it is a near-duplicate of one already indexed.
+        Returns True if it was added, False if it was rejected as a duplicate.
+        """
+        question_shingles = shingles(question)
+        signature = self._signature(question_shingles)
+        with self._lock:
+            self._expire()
+            if question in self._entries or self._find(question_shingles, signature) is not None:
+                return False
+            self._entries[question] = (question_shingles, signature, time.monotonic())
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, set()).add(question)
+            while len(self._entries) > self.capacity:
+                self._forget(next(iter(self._entries)))
+            return True
+
+    def _expire(self) -> None:
+        if self.max_age_seconds is None:
+            return
+        cutoff = time.monotonic() - self.max_age_seconds
+        # Entries are kept in the order they were added, so the expired ones are at the front
+        while self._entries and next(iter(self._entries.values()))[2] < cutoff:
+            self._forget(next(iter(self._entries)))
+
+    def _forget(self, question: str) -> None:
+        _, signature, _ = self._entries.pop(question)
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band][key]
+            bucket.discard(question)
+            if not bucket:
+                del self._buckets[band][key]
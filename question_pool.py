@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from question_index import QuestionIndex
+
+
+class QuestionPool:
+    """
+    Process-wide pool of pre-generated interview questions.
+
+    Questions are bucketed by (difficulty level, topic), each stored with its
+    reference answer (or None) so the two are always served together. A
+    background worker keeps every bucket topped up: once a bucket drops below the
+    low-water mark it is refilled to capacity, one question per bucket per pass
+    so all topics fill evenly. Questions older than max_age_seconds are evicted, and when a bucket is
+    over capacity the oldest question is dropped first.
+
+    With an index, a generated question that is a near-duplicate of one seen
+    before is rejected instead of pooled. A bucket whose question was rejected is
+    not retried until the next refill pass, so paraphrases never trigger a
+    burst of regeneration.
+
+    While generation keeps failing (the API is down, the key is bad or the quota
+    is spent) the worker backs off exponentially from retry_delay_seconds up to
+    max_retry_delay_seconds, and starts again from the shortest delay after a success.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[int, str], Optional[Tuple[str, Optional[str]]]],
+        topics_by_level: Dict[int, List[str]],
+        low_water_mark: int = 1,
+        capacity: int = 3,
+        max_age_seconds: float = 6 * 60 * 60,
+        retry_delay_seconds: float = 30.0,
+        max_retry_delay_seconds: float = 30 * 60,
+        index: Optional[QuestionIndex] = None
+    ):
+        self._generate = generate
+        self.index = index
+        self._low_water_mark = low_water_mark
+        self._capacity = capacity
+        self._max_age_seconds = max_age_seconds
+        self._retry_delay_seconds = retry_delay_seconds
+        self._max_retry_delay_seconds = max_retry_delay_seconds
+        self._buckets: Dict[Tuple[int, str], Deque[Tuple[float, str, Optional[str]]]] = {
+            (level, topic): deque()
+            for level, topics in topics_by_level.items()
+            for topic in topics
+        }
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        """Start the background refill worker if it is not already running."""
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name="question-pool-refill", daemon=True)
+            self._worker.start()
+        self._wakeup.set()
+
+    def get(
+        self,
+        level: int,
+        topic: str,
+        reject: Optional[Callable[[str], bool]] = None
+    ) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Take a pre-generated (question, reference answer) for the level and topic, or None if the bucket is empty.
+        Questions for which `reject` returns True are skipped and left in the pool for others.
+        """
+        with self._lock:
+            bucket = self._buckets.get((level, topic))
+            if bucket is None:
+                return None
+            self._evict_expired(bucket)
+            question = None
+            for entry in bucket:
+                if reject is None or not reject(entry[1]):
+                    question = entry[1:]
+                    bucket.remove(entry)
+                    break
+            if question is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            needs_refill = len(bucket) < self._low_water_mark
+        if needs_refill:
+            self._wakeup.set()
+        return question
+
+    def put(self, level: int, topic: str, question: str, reference_answer: Optional[str] = None) -> bool:
+        """
+        Add a question and its reference answer to the pool, evicting the oldest one if the bucket is full.
+        Returns False if the index rejected it as a near-duplicate.
+        """
+        if self.index is not None and not self.index.add(question):
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            bucket = self._buckets.setdefault((level, topic), deque())
+            bucket.append((time.monotonic(), question, reference_answer))
+            while len(bucket) > self._capacity:
+                bucket.popleft()
+        return True
+
+    def sizes(self) -> Dict[Tuple[int, str], int]:
+        """Return the number of questions currently held per (level, topic)."""
+        with self._lock:
+            return {key: len(bucket) for key, bucket in self._buckets.items()}
+
+    def _evict_expired(self, bucket: Deque[Tuple[float, str, Optional[str]]]) -> None:
+        cutoff = time.monotonic() - self._max_age_seconds
+        while bucket and bucket[0][0] < cutoff:
+            bucket.popleft()
+
+    def _buckets_to_refill(self) -> List[Tuple[int, str]]:
+        with self._lock:
+            for bucket in self._buckets.values():
+                self._evict_expired(bucket)
+            return [key for key, bucket in self._buckets.items() if len(bucket) < self._low_water_mark]
+
+    def _run(self) -> None:
+        retry_delay = self._retry_delay_seconds
+        while True:
+            self._wakeup.wait(timeout=self._max_age_seconds / 2)
+            self._wakeup.clear()
+
+            pending = self._buckets_to_refill()
+            while pending:
+                failed = False
+                rejected = set()
+                for level, topic in pending:
+                    generated = self._generate(level, topic)
+                    if generated is None:
+                        failed = True
+                        break
+                    retry_delay = self._retry_delay_seconds
+                    if not self.put(level, topic, *generated):
+                        rejected.add((level, topic))
+                if failed:
+                    # The API is unavailable or throttled; back off instead of hammering it
+                    time.sleep(retry_delay)
+                    retry_delay = min(retry_delay * 2, self._max_retry_delay_seconds)
+                with self._lock:
+                    pending = [
+                        key for key in pending
+                        if key not in rejected and len(self._buckets[key]) < self._capacity
+                    ]
@@ -0,0 +1,158 @@
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Callable, Iterator, List, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+GEMINI_REQUESTS_PER_MINUTE = float(os.environ.get("GEMINI_REQUESTS_PER_MINUTE", "60"))
+GEMINI_BURST = float(os.environ.get("GEMINI_BURST", "10"))
+GEMINI_MAX_CONCURRENCY = int(os.environ.get("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_MAX_RETRIES = int(os.environ.get("GEMINI_MAX_RETRIES", "2"))
+
+# HTTP status codes of errors worth retrying: quota exhaustion and transient server failures
+RETRYABLE_STATUS_CODES = {429, 500, 503, 504}
+
+
+class Priority(IntEnum):
+    """Request classes, most urgent first. Lower values are scheduled ahead of higher ones."""
+    EVALUATION = 0
+    REPORT = 1
+    QUESTION = 2
+    RETRY = 3
+    PREFETCH = 4
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` requests per second on average, with bursts up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def try_acquire(self) -> float:
+        """Take a token and return 0, or return the seconds until one becomes available."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+def is_retryable(error: Exception) -> bool:
+    """Return True for quota and transient server errors from the Gemini client."""
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and code in RETRYABLE_STATUS_CODES:
+        return True
+    return type(error).__name__ in {"ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded", "InternalServerError"}
+
+
+class RequestScheduler:
+    """
+    Process-wide gate in front of the Gemini API.
+
+    Callers wait for a slot in priority order. A slot is granted when fewer than
+    max_concurrency requests are in flight and the token bucket has a token, so
+    under load requests queue up instead of all failing against the quota.
+    Retryable failures are retried with jittered exponential backoff at RETRY
+    priority, behind all first attempts except background pre-generation.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 60,
+        burst: float = 10,
+        max_concurrency: int = 8,
+        max_retries: int = 2,
+        base_delay: float = 1.0,
+        max_delay: float = 20.0
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._bucket = TokenBucket(requests_per_minute / 60, burst)
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._active = 0
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    @contextmanager
+    def slot(self, priority: Priority) -> Iterator[None]:
+        """Hold one request slot for the duration of the block."""
+        self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def run(self, request: Callable[[], T], priority: Priority) -> T:
+        """
+        Run `request` once a slot is free, retrying retryable errors with backoff.
+        The last error is re-raised once retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            try:
+                with self.slot(priority if attempt == 0 else Priority.RETRY):
+                    return request()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+            time.sleep(self.backoff_delay(attempt))
+            attempt += 1
+
+    def _acquire(self, priority: Priority) -> None:
+        with self._cond:
+            entry = (int(priority), next(self._sequence))
+            heapq.heappush(self._waiters, entry)
+            while True:
+                wait: Optional[float] = None
+                if self._waiters[0] == entry and self._active < self.max_concurrency:
+                    wait = self._bucket.try_acquire()
+                    if wait == 0:
+                        heapq.heappop(self._waiters)
+                        self._active += 1
+                        # The next waiter may be able to go as well
+                        self._cond.notify_all()
+                        return
+                self._cond.wait(timeout=wait)
+
+    def _release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+    """Return the process-wide request scheduler, creating it on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(
+                requests_per_minute=GEMINI_REQUESTS_PER_MINUTE,
+                burst=GEMINI_BURST,
+                max_concurrency=GEMINI_MAX_CONCURRENCY,
+                max_retries=GEMINI_MAX_RETRIES
+            )
+        return _scheduler
@@ -0,0 +1,163 @@
+import json
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+
+# "sqlite" keeps sessions in SESSION_STORE_PATH; "memory" keeps them only for the life of the process
+SESSION_STORE = os.environ.get("SESSION_STORE", "sqlite")
+SESSION_STORE_PATH = os.environ.get("SESSION_STORE_PATH", "sessions.db")
+SESSION_TTL_SECONDS = int(os.environ.get("SESSION_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_-]{16,64}")
+
+
+def new_session_token() -> str:
+    """Return a fresh unguessable session token, safe to put in a URL."""
+    return secrets.token_urlsafe(24)
+
+
+def is_valid_token(token: Optional[str]) -> bool:
+    return token is not None and _TOKEN_PATTERN.fullmatch(token) is not None
+
+
+def encode_state(state: Mapping[str, Any]) -> Dict[str, str]:
+    """Serialize each value to JSON so the stored form can be compared cheaply."""
+    return {key: json.dumps(value, ensure_ascii=False, sort_keys=True) for key, value in state.items()}
+
+
+class SessionStore(ABC):
+    """
+    Persistent interview state, stored per session token as one JSON value per key.
+
+    Subclasses implement load_encoded and write; save_changes only writes the keys
+    whose value differs from what was last stored, so a rerun that changes one
+    answer writes one row instead of the whole session.
+    """
+
+    @abstractmethod
+    def load_encoded(self, token: str) -> Dict[str, str]:
+        """Return the encoded state saved for a token, or an empty dict for an unknown or expired one."""
+
+    @abstractmethod
+    def write(self, token: str, changed: Dict[str, str], deleted: Iterable[str]) -> None:
+        """Store the changed encoded keys of a token's state and delete the given keys."""
+
+    def load(self, token: str) -> Dict[str, Any]:
+        """Return the saved state for a token, or an empty dict for an unknown or expired one."""
+        return {key: json.loads(value) for key, value in self.load_encoded(token).items()}
+
+    def save_changes(self, token: str, state: Mapping[str, Any], stored: Dict[str, str]) -> Dict[str, str]:
+        """
+        Write the keys of `state` that differ from `stored` (the encoded state last saved)
+        and delete stored keys missing from `state`. Returns the new encoded state.
+        """
+        encoded = encode_state(state)
+        changed = {key: value for key, value in encoded.items() if stored.get(key) != value}
+        deleted = [key for key in stored if key not in encoded]
+        if changed or deleted:
+            self.write(token, changed, deleted)
+        return encoded
+
+
+class MemorySessionStore(SessionStore):
+    """Session store held in process memory; state survives reruns and reconnects but not restarts."""
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def load_encoded(self, token: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._sessions.get(token, {}))
+
+    def write(self, token: str, changed: Dict[str, str], deleted: Iterable[str]) -> None:
+        with self._lock:
+            session = self._sessions.setdefault(token, {})
+            session.update(changed)
+            for key in deleted:
+                session.pop(key, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Session store in a SQLite file, shared by every process that opens the same path.
+
+    Sessions not written to for ttl_seconds are ignored, and purged every prune_interval writes.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 60 * 60, prune_interval: int = 200):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.prune_interval = prune_interval
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS session_state (
+                    token TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    PRIMARY KEY (token, key)
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS sessions (
+                    token TEXT PRIMARY KEY,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)")
+
+    def load_encoded(self, token: str) -> Dict[str, str]:
+        with self._lock:
+            alive = self._conn.execute(
+                "SELECT 1 FROM sessions WHERE token = ? AND updated_at > ?",
+                (token, time.time() - self.ttl_seconds)
+            ).fetchone()
+            if alive is None:
+                return {}
+            rows = self._conn.execute("SELECT key, value FROM session_state WHERE token = ?", (token,)).fetchall()
+        return dict(rows)
+
+    def write(self, token: str, changed: Dict[str, str], deleted: Iterable[str]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO session_state (token, key, value) VALUES (?, ?, ?)",
+                [(token, key, value) for key, value in changed.items()]
+            )
+            self._conn.executemany(
+                "DELETE FROM session_state WHERE token = ? AND key = ?",
+                [(token, key) for key in deleted]
+            )
+            self._conn.execute("INSERT OR REPLACE INTO sessions (token, updated_at) VALUES (?, ?)", (token, now))
+            self._writes += 1
+            if self._writes % self.prune_interval != 0:
+                return
+            expired = "SELECT token FROM sessions WHERE updated_at <= ?"
+            self._conn.execute(f"DELETE FROM session_state WHERE token IN ({expired})", (now - self.ttl_seconds,))
+            self._conn.execute("DELETE FROM sessions WHERE updated_at <= ?", (now - self.ttl_seconds,))
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store selected by SESSION_STORE, opening it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if SESSION_STORE == "memory":
+                _store = MemorySessionStore()
+            else:
+                _store = SQLiteSessionStore(SESSION_STORE_PATH, ttl_seconds=SESSION_TTL_SECONDS)
+        return _store
@@ -0,0 +1,102 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from catalog import BANK_SEED_QUESTIONS, IDF_CORPUS
+from question_index import STOP_WORDS
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Cosine similarity to the reference answer from which an answer earns full or partial credit
+SIMILARITY_FULL_CREDIT = 0.4
+SIMILARITY_PARTIAL_CREDIT = 0.15
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split a text into lowercase terms, dropping stop words and a plural "s".
+    Formula names and cell references (SUMIFS, A2) survive as terms of their own.
+    """
+    words = (word.rstrip("s") if len(word) > 3 else word for word in re.findall(r"[a-z0-9]+", text.lower()))
+    return [word for word in words if word not in STOP_WORDS]
+
+
+class SimilarityGrader:
+    """
+    Scores answers by the TF-IDF cosine similarity between each answer and its reference answer.
+
+    Inverse document frequencies are fitted once on a corpus of reference
+    answers, so terms every answer uses ("cell", "formula") count for little and
+    specific ones ("sumifs", "slicer") for a lot; terms missing from the corpus
+    get the highest weight. A batch of answers is vectorized and compared in one
+    NumPy pass. NumPy is only imported once answers are first compared, so it
+    stays off the app's startup path.
+    """
+
+    def __init__(self, corpus: Iterable[str]):
+        document_frequencies: Counter = Counter()
+        documents = 0
+        for document in corpus:
+            document_frequencies.update(set(tokenize(document)))
+            documents += 1
+        self._idf: Dict[str, float] = {
+            term: math.log((1 + documents) / (1 + frequency)) + 1 for term, frequency in document_frequencies.items()
+        }
+        self._unseen_idf = math.log(1 + documents) + 1
+
+    def _vectors(self, texts: Sequence[str], vocabulary: Dict[str, int]) -> "np.ndarray":
+        """Return L2-normalized TF-IDF rows (sublinear term frequency) over the given vocabulary."""
+        import numpy as np
+
+        vectors = np.zeros((len(texts), len(vocabulary)))
+        for row, text in enumerate(texts):
+            for term, count in Counter(tokenize(text)).items():
+                vectors[row, vocabulary[term]] = (1 + math.log(count)) * self._idf.get(term, self._unseen_idf)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    def similarities(self, answers: Sequence[str], references: Sequence[str]) -> "np.ndarray":
+        """Return the cosine similarity of each answer to the reference at the same position."""
+        import numpy as np
+
+        if not answers:
+            return np.zeros(0)
+        vocabulary: Dict[str, int] = {}
+        for text in list(answers) + list(references):
+            for term in tokenize(text):
+                vocabulary.setdefault(term, len(vocabulary))
+        return np.einsum("ij,ij->i", self._vectors(answers, vocabulary), self._vectors(references, vocabulary))
+
+    def grade(self, answers: Sequence[str], references: Sequence[str]) -> List[Tuple[int, str, float]]:
+        """Score each answer against its reference, returning (score, explanation, similarity)."""
+        return [
+            (*score_for_similarity(similarity), float(similarity))
+            for similarity in self.similarities(answers, references)
+        ]
+
+
+def score_for_similarity(similarity: float) -> Tuple[int, str]:
+    if similarity >= SIMILARITY_FULL_CREDIT:
+        return 2, "Covers the key points of the reference answer"
+    if similarity >= SIMILARITY_PARTIAL_CREDIT:
+        return 1, "Covers some points of the reference answer but misses others"
+    return 0, "Has little in common with the reference answer"
+
+
+_grader: Optional[SimilarityGrader] = None
+_grader_lock = threading.Lock()
+
+
+def get_similarity_grader() -> SimilarityGrader:
+    """Return the process-wide grader, fitted on the built-in reference answers on first use."""
+    global _grader
+    with _grader_lock:
+        if _grader is None:
+            _grader = SimilarityGrader(
+                list(IDF_CORPUS) + [reference_answer for *_, reference_answer in BANK_SEED_QUESTIONS]
+            )
+        return _grader
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# The modules sit at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Read when the modules are first imported: keep tests off the network and the working directory
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY_SECONDS", "0")
+os.environ.setdefault("EVALUATION_CACHE_PATH", ":memory:")
+os.environ.setdefault("QUESTION_BANK_PATH", ":memory:")
+os.environ.setdefault("QUESTION_POOL_REFILL", "0")
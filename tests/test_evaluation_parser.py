@@ -0,0 +1,55 @@
+from evaluation_parser import load_json, parse_batch_evaluation, parse_evaluation, validate_score
+
+
+def test_structured_evaluation_decodes_without_repair():
+    assert parse_evaluation('{"score": 1, "explanation": "Partly right."}') == ((1, "Partly right."), False)
+
+
+def test_score_line_takes_the_score_not_later_digits():
+    result, repaired = parse_evaluation("Score: 2/2 (not 0)\nExplanation: Covers every step.")
+    assert result == (2, "Covers every step.")
+    assert repaired
+
+
+def test_markdown_score_line():
+    result, _ = parse_evaluation("**Score:** 1\n**Explanation:** Misses the lookup.")
+    assert result == (1, "Misses the lookup.")
+
+
+def test_out_of_range_or_fractional_scores_are_rejected():
+    assert parse_evaluation("Score: 5\nExplanation: Generous.")[0] is None
+    assert parse_evaluation("Score: 1.5\nExplanation: Halfway.")[0] is None
+    assert validate_score("2/2") == 2
+    assert validate_score(True) is None
+
+
+def test_damaged_object_keeps_its_fields():
+    result, repaired = parse_evaluation('{"score": 2, "explanation": "Uses SUMIFS with two crit')
+    assert result == (2, "Uses SUMIFS with two crit")
+    assert repaired
+
+
+def test_trailing_commas_and_code_fences_are_repaired():
+    text = '```json\n[{"id": 1, "score": 2, "explanation": "Good",},]\n```'
+    assert load_json(text, '[') == ([{"id": 1, "score": 2, "explanation": "Good"}], True)
+
+
+def test_curly_quotes_are_repaired():
+    value, repaired = load_json('{“score”: 0, “explanation”: “Blank”}', '{')
+    assert value == {"score": 0, "explanation": "Blank"}
+    assert repaired
+
+
+def test_truncated_batch_keeps_complete_items():
+    text = '[{"id": 1, "score": 2, "explanation": "Good"}, {"id": 2, "score": 1, "explanation": "Par'
+    assert parse_batch_evaluation(text, 2) == ({0: (2, "Good")}, True)
+
+
+def test_batch_drops_invalid_and_repeated_ids():
+    text = (
+        '[{"id": 1, "score": 2, "explanation": "First"},'
+        ' {"id": 1, "score": 0, "explanation": "Repeat"},'
+        ' {"id": 3, "score": 1, "explanation": "Out of range"},'
+        ' {"id": 2, "score": 7, "explanation": "Bad score"}]'
+    )
+    assert parse_batch_evaluation(text, 2) == ({0: (2, "First")}, False)
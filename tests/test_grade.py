@@ -0,0 +1,62 @@
+import json
+
+from grade import grade_file, load_checkpoint, save_checkpoint
+
+
+def write_transcripts(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({
+                'candidate': i,
+                'questions_answers': [
+                    {'question': "How would you total sales per region?", 'answer': "Use SUMIFS with the region as the criteria."},
+                    {'question': "How do you find duplicates?", 'answer': "I don't know"}
+                ],
+                'skipped_questions': [1] if i % 2 else []
+            }) + "\n")
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_offline_grading_writes_every_transcript_in_order(tmp_path):
+    transcripts, output = tmp_path / "transcripts.jsonl", tmp_path / "scored.jsonl"
+    write_transcripts(transcripts, 5)
+
+    assert grade_file(str(transcripts), str(output), workers=2, offline=True) == 5
+
+    records = [json.loads(line) for line in read_lines(output)]
+    assert [record['candidate'] for record in records] == list(range(5))
+    assert records[1]['questions_answers'][1]['evaluation_tier'] == 'skipped'
+    assert all(qa['evaluation_tier'] in ('fallback', 'skipped') for record in records for qa in record['questions_answers'])
+    assert load_checkpoint(str(output) + ".checkpoint") == (5, output.stat().st_size)
+
+
+def test_resume_drops_output_after_the_checkpoint_and_grades_the_rest(tmp_path):
+    transcripts, output = tmp_path / "transcripts.jsonl", tmp_path / "scored.jsonl"
+    write_transcripts(transcripts, 5)
+    grade_file(str(transcripts), str(output), workers=2, offline=True)
+    expected = read_lines(output)
+
+    # Interrupted after two checkpointed lines, with part of a third written
+    checkpoint_bytes = sum(len(line.encode("utf-8")) + 1 for line in expected[:2])
+    with open(output, "r+", encoding="utf-8") as f:
+        f.truncate(checkpoint_bytes)
+        f.seek(checkpoint_bytes)
+        f.write('{"candidate": 2, "questions_ans')
+    save_checkpoint(str(output) + ".checkpoint", 2, checkpoint_bytes)
+
+    assert grade_file(str(transcripts), str(output), workers=2, offline=True) == 3
+    assert read_lines(output) == expected
+
+
+def test_finished_run_is_not_graded_again(tmp_path):
+    transcripts, output = tmp_path / "transcripts.jsonl", tmp_path / "scored.jsonl"
+    write_transcripts(transcripts, 3)
+    grade_file(str(transcripts), str(output), offline=True)
+    expected = read_lines(output)
+
+    assert grade_file(str(transcripts), str(output), offline=True) == 0
+    assert read_lines(output) == expected
@@ -0,0 +1,76 @@
+import sqlite3
+
+import pytest
+
+import interviewer
+from evaluation_cache import EvaluationCache
+from metrics import registry
+
+
+def counter(name, **labels):
+    series = registry.snapshot()['counters'].get(name, [])
+    return sum(entry['value'] for entry in series if entry['labels'] == labels)
+
+
+@pytest.fixture
+def locked_cache(monkeypatch):
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(EvaluationCache, "get", locked)
+    monkeypatch.setattr(EvaluationCache, "put", locked)
+
+
+def test_locked_cache_is_a_miss_for_single_evaluations(locked_cache):
+    errors = counter("evaluation_cache_errors_total", operation="get")
+    score, explanation, tier = interviewer.evaluate_answer(
+        "How would you total sales per region?",
+        "I would build a pivot table with the region in rows and sum the sales column."
+    )
+    assert score in (0, 1, 2) and explanation
+    assert tier in ("llm", "fallback")
+    assert counter("evaluation_cache_errors_total", operation="get") == errors + 1
+
+
+def test_locked_cache_does_not_fail_evaluating_an_interview(locked_cache):
+    questions_answers = [
+        {'question': f"Question {i} about lookups?", 'answer': f"Use XLOOKUP with exact match on column {i}.", 'score': 0, 'explanation': ''}
+        for i in range(3)
+    ]
+    interviewer.evaluate_all_answers(questions_answers, [])
+    assert all(qa['evaluation_tier'] in ("llm", "fallback") for qa in questions_answers)
+
+
+class FixedSimilarities:
+    def __init__(self, similarities):
+        self.similarities_by_answer = similarities
+
+    def similarities(self, answers, references):
+        return [self.similarities_by_answer[answer] for answer in answers]
+
+
+LONG_ANSWERS = [f"A detailed answer about lookups, number {i}." for i in range(5)]
+
+
+def test_cascade_settles_blank_and_brief_answers_without_a_reference():
+    pairs = [("Q1", "   "), ("Q2", "Use SUM."), ("Q3", LONG_ANSWERS[0])]
+    assert interviewer.cascade_scores(pairs, [None, None, None]) == {
+        0: (0, "No answer given", "blank"),
+        1: (0, "Answer too brief - please provide more detail", "brief")
+    }
+
+
+def test_cascade_similarity_thresholds(monkeypatch):
+    similarities = dict(zip(LONG_ANSWERS, [0.8, 0.79, 0.05, 0.049, 0.95]))
+    monkeypatch.setattr(interviewer, "get_similarity_grader", lambda: FixedSimilarities(similarities))
+    pairs = [(f"Q{i}", answer) for i, answer in enumerate(LONG_ANSWERS)]
+    references = ["Reference answer."] * 4 + [None]
+
+    results = interviewer.cascade_scores(pairs, references)
+
+    # Only clear accepts and clear rejects are settled; the rest, and answers without a reference, go to the model
+    assert {i: (score, tier) for i, (score, _, tier) in results.items()} == {0: (2, "similarity"), 3: (0, "similarity")}
+
+
+def test_cascade_can_be_turned_off(monkeypatch):
+    monkeypatch.setattr(interviewer, "CASCADE_EVALUATION", False)
+    assert interviewer.cascade_scores([("Q", "")], [None]) == {}
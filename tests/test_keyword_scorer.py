@@ -0,0 +1,45 @@
+from keyword_scorer import match_keywords, match_keywords_batch
+
+
+def test_inflected_keywords_match():
+    match = match_keywords("I'd start by sorting the rows, then filtered them and wrote some formulas.")
+    assert match.keywords == {"sort", "filter", "formula"}
+
+
+def test_formulae_counts_as_formula():
+    assert match_keywords("Array formulae are evaluated per cell.").keywords == {"formula"}
+
+
+def test_hyphenated_and_spaced_terms_match():
+    assert match_keywords("Apply conditional-formatting to the column.").keywords == {"conditional formatting"}
+    assert match_keywords("Add a pivot\ntable.").keywords == {"pivot table"}
+
+
+def test_longer_term_wins():
+    assert match_keywords("Build a pivot table with a slicer.").keywords == {"pivot table", "slicer"}
+
+
+def test_keywords_do_not_match_inside_other_words():
+    assert match_keywords("The pvt shows each fvalue and the indexer.").keywords == frozenset()
+
+
+def test_other_inflections_only_match_through_aliases():
+    assert match_keywords("Indexing the table and matching rows while I was functioning.").keywords == frozenset()
+    assert match_keywords("Sorted by date, then filtering and sorting again.").keywords == {"sort", "filter"}
+    assert match_keywords("Use INDEX and MATCH over several charts and macros.").keywords == {"index", "match", "chart", "macro"}
+
+
+def test_weights_favour_specific_features():
+    generic = match_keywords("Use a formula and a function, then sort and filter.")
+    specific = match_keywords("Use SUMIFS and VLOOKUP.")
+    assert generic.weighted_total == 2.0
+    assert specific.weighted_total == 2.0
+    assert specific.topic_hits == {"conditional aggregation": 1.0, "lookup": 1.0}
+
+
+def test_batch_matches_each_answer_separately():
+    answers = ["Use a pivot", "table of data", "", "Record a macro"]
+    matches = match_keywords_batch(answers)
+    assert [match.keywords for match in matches] == [{"pivot"}, frozenset(), frozenset(), {"macro"}]
+    assert [match.mentions_basics for match in matches] == [False, True, False, False]
+    assert matches == [match_keywords(answer) for answer in answers]
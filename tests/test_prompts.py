@@ -0,0 +1,39 @@
+from prompts import TRUNCATION_MARKER, PromptTemplate, compact, count_tokens, truncate_to_tokens
+
+
+ANSWER = " ".join(f"word{i}" for i in range(200))
+
+
+def test_short_text_is_left_alone():
+    assert truncate_to_tokens("Use SUMIFS.", 10) == "Use SUMIFS."
+
+
+def test_truncation_fits_the_budget_and_keeps_both_ends_at_word_boundaries():
+    truncated = truncate_to_tokens(ANSWER, 50)
+    assert count_tokens(truncated) <= 50
+    head, tail = truncated.split(TRUNCATION_MARKER)
+    assert ANSWER.startswith(head) and ANSWER.endswith(tail)
+    assert all(word in ANSWER.split() for word in head.split() + tail.split())
+    assert len(head) > len(tail)
+
+
+def test_compact_strips_indentation_and_blank_runs():
+    assert compact("\n    First line  \n\n\n\n    Second line\n") == "First line\n\nSecond line"
+
+
+def test_render_shrinks_the_named_field_to_the_budget():
+    template = PromptTemplate("test", """
+        Score these answers.
+        {answers}
+    """, budget=60, shrink="answers")
+    prompt = template.render(answers=ANSWER)
+    assert count_tokens(prompt) <= 60
+    assert prompt.startswith("Score these answers.\nword0")
+    assert TRUNCATION_MARKER in prompt
+
+
+def test_render_within_budget_is_unchanged_and_clip_limits_answers():
+    template = PromptTemplate("test", "Answer: {answer}", budget=1000, shrink="answer", answer_tokens=20)
+    assert template.render(answer="Use a pivot table.") == "Answer: Use a pivot table."
+    assert count_tokens(template.clip(ANSWER)) <= 20
+    assert template.clip("Short answer.") == "Short answer."
@@ -0,0 +1,50 @@
+import pytest
+
+from question_bank import QuestionBank, affine_position
+
+
+@pytest.fixture
+def bank():
+    bank = QuestionBank(":memory:")
+    bank.add_many(
+        (level, f"topic {i % 3}", f"Level {level} question number {i}?", f"Answer {level}.{i}")
+        for level in (1, 2)
+        for i in range(12)
+    )
+    return bank
+
+
+@pytest.mark.parametrize("size", [1, 7, 12, 30])
+def test_affine_position_visits_every_position_once(size):
+    for seed in range(5):
+        assert sorted(affine_position(seed, "1:", draw, size) for draw in range(size)) == list(range(size))
+
+
+def test_draws_never_repeat_within_a_seed(bank):
+    for seed in range(10):
+        drawn = [bank.draw(1, seed, draw) for draw in range(12)]
+        assert len({question for question, _ in drawn}) == 12
+        assert all(question.startswith("Level 1 ") for question, _ in drawn)
+
+
+def test_topic_draws_stay_in_the_topic_without_repeats(bank):
+    drawn = [bank.draw(2, 3, draw, "topic 1") for draw in range(4)]
+    assert {question for question, _ in drawn} == {f"Level 2 question number {i}?" for i in (1, 4, 7, 10)}
+
+
+def test_draws_are_reproducible_and_seeds_differ(bank):
+    orders = {seed: [bank.draw(1, seed, draw)[0] for draw in range(12)] for seed in range(5)}
+    assert orders[0] == [bank.draw(1, 0, draw)[0] for draw in range(12)]
+    assert len({tuple(order) for order in orders.values()}) > 1
+
+
+def test_draw_returns_the_stored_reference_answer(bank):
+    question, reference_answer = bank.draw(1, 0, 0)
+    assert reference_answer == "Answer " + question[len("Level "):-1].replace(" question number ", ".")
+    assert bank.reference_answer(question) == reference_answer
+
+
+def test_empty_groups_and_repeats(bank):
+    assert bank.draw(5, 0, 0) is None
+    assert bank.add_many([(1, "topic 0", "Level 1 question number 0?", None)]) == 0
+    assert bank.size(1) == 12 and bank.size() == 24
@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+import request_scheduler
+from request_scheduler import Priority, RequestScheduler, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class QuotaError(Exception):
+    code = 429
+
+
+def test_token_bucket_allows_a_burst_then_refills_at_the_rate(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(request_scheduler.time, "monotonic", clock)
+    bucket = TokenBucket(rate=2, capacity=2)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0
+    # Idle time never banks more than the burst capacity
+    clock.now += 60
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, pytest.approx(0.5)]
+
+
+def test_waiting_requests_are_granted_in_priority_order():
+    scheduler = RequestScheduler(requests_per_minute=60000, burst=100, max_concurrency=1)
+    granted = []
+
+    def request(priority):
+        with scheduler.slot(priority):
+            granted.append(priority)
+
+    threads = []
+    with scheduler.slot(Priority.QUESTION):
+        for priority in (Priority.PREFETCH, Priority.QUESTION, Priority.EVALUATION, Priority.REPORT):
+            thread = threading.Thread(target=request, args=(priority,))
+            thread.start()
+            threads.append(thread)
+            # Queue the requests one at a time so arrival order differs from priority order
+            while len(scheduler._waiters) < len(threads):
+                time.sleep(0.001)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert granted == [Priority.EVALUATION, Priority.REPORT, Priority.QUESTION, Priority.PREFETCH]
+
+
+def test_retryable_errors_are_retried_and_others_raised():
+    scheduler = RequestScheduler(requests_per_minute=60000, burst=100, base_delay=0, max_retries=2)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise QuotaError("quota exceeded")
+        return "ok"
+
+    assert scheduler.run(flaky, Priority.EVALUATION) == "ok"
+    assert len(attempts) == 3
+
+    def broken():
+        attempts.append(1)
+        raise ValueError("bad request")
+
+    attempts.clear()
+    with pytest.raises(ValueError):
+        scheduler.run(broken, Priority.EVALUATION)
+    assert len(attempts) == 1
@@ -0,0 +1,49 @@
+import pytest
+
+from session_store import MemorySessionStore, SessionStore, SQLiteSessionStore, encode_state
+
+
+class RecordingStore(MemorySessionStore):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, token, changed, deleted):
+        self.writes.append((changed, sorted(deleted)))
+        super().write(token, changed, deleted)
+
+
+TOKEN = "session-token-0123456789"
+
+
+def test_only_changed_and_deleted_keys_are_written():
+    store = RecordingStore()
+    stored = store.save_changes(TOKEN, {'current_question': 0, 'answers': ["a"], 'draft': "x"}, {})
+    assert store.writes[-1] == (encode_state({'current_question': 0, 'answers': ["a"], 'draft': "x"}), [])
+
+    stored = store.save_changes(TOKEN, {'current_question': 1, 'answers': ["a"]}, stored)
+    assert store.writes[-1] == ({'current_question': "1"}, ['draft'])
+    assert store.load(TOKEN) == {'current_question': 1, 'answers': ["a"]}
+
+
+def test_unchanged_state_is_not_written():
+    store = RecordingStore()
+    stored = store.save_changes(TOKEN, {'answers': {"b": 1, "a": 2}}, {})
+    # Key order doesn't make a value differ
+    store.save_changes(TOKEN, {'answers': {"a": 2, "b": 1}}, stored)
+    assert len(store.writes) == 1
+
+
+def test_sqlite_store_round_trips_and_expires(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    stored = store.save_changes(TOKEN, {'questions_answers': [{'question': "Q", 'score': 2}], 'draft': ""}, {})
+    store.save_changes(TOKEN, {'questions_answers': [{'question': "Q", 'score': 2}]}, stored)
+
+    reopened = SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl_seconds=60)
+    assert reopened.load(TOKEN) == {'questions_answers': [{'question': "Q", 'score': 2}]}
+    assert SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl_seconds=-1).load(TOKEN) == {}
+
+
+def test_session_store_is_abstract():
+    with pytest.raises(TypeError):
+        SessionStore()